@@ -6,10 +6,12 @@ This demonstrates how to use the tool's modules directly in Python code,
 rather than through the CLI.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from sanger_qc_trim.io_utils import parse_sequence_file, get_sample_id
 from sanger_qc_trim.trim import apply_trim
 from sanger_qc_trim.qc import compute_qc_metrics, compute_summary_stats
+from sanger_qc_trim.ambiguous_calling import AmbiguousBaseCaller, MODE_AMBIGUOUS
 
 
 def example_process_single_file():
@@ -39,7 +41,7 @@ def example_process_single_file():
     print(f"Sample ID: {sample_id}")
     print(f"Sequence length: {len(seq)}")
     print(f"Quality scores: {len(quals)}")
-    print(f"Mean quality: {sum(quals) / len(quals):.2f}")
+    print(f"Mean quality: {quals.mean():.2f}")
     print()
 
     # Apply Mott trimming at Q20
@@ -109,6 +111,44 @@ def example_compare_trimming_methods():
     print()
 
 
+def _process_file(item):
+    """Parse, trim, call and compute QC metrics for one (file_path, format) pair."""
+    file_path, file_format = item
+
+    result = parse_sequence_file(file_path, file_format)
+    if result is None:
+        return None
+
+    seq, quals = result
+    sample_id = get_sample_id(file_path)
+
+    # Apply trimming
+    _, _, trim_start, trim_end = apply_trim(seq, quals, "mott", 20)
+
+    # Ambiguous calling only needs the region that survives trimming
+    n_ambiguous = None
+    if file_format == "ab1":
+        base_calls = AmbiguousBaseCaller().call_bases(
+            file_path, seq, quals, trim_bounds=(trim_start, trim_end)
+        )
+        n_ambiguous = int((base_calls.call_mode == MODE_AMBIGUOUS).sum())
+
+    # Compute metrics
+    metrics = compute_qc_metrics(
+        sample_id=sample_id,
+        source_file=str(file_path),
+        file_format=file_format,
+        seq=seq,
+        quals=quals,
+        trim_start=trim_start,
+        trim_end=trim_end,
+        qthreshold=20,
+        min_length=50,
+    )
+
+    return metrics, n_ambiguous
+
+
 def example_batch_processing():
     """Example: Batch process multiple files."""
 
@@ -124,39 +164,27 @@ def example_batch_processing():
     print(f"Found {len(files)} files")
     print()
 
+    # Files are independent, so spread them over worker processes;
+    # map() keeps the results in discovery order
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(_process_file, files, chunksize=4))
+
     metrics_list = []
 
-    for file_path, file_format in files:
+    for (file_path, _), result in zip(files, results):
         print(f"Processing: {file_path.name}")
 
-        result = parse_sequence_file(file_path, file_format)
         if result is None:
             print(f"  Skipped (parsing failed)")
             continue
 
-        seq, quals = result
-        sample_id = get_sample_id(file_path)
-
-        # Apply trimming
-        _, _, trim_start, trim_end = apply_trim(seq, quals, "mott", 20)
-
-        # Compute metrics
-        metrics = compute_qc_metrics(
-            sample_id=sample_id,
-            source_file=str(file_path),
-            file_format=file_format,
-            seq=seq,
-            quals=quals,
-            trim_start=trim_start,
-            trim_end=trim_end,
-            qthreshold=20,
-            min_length=50,
-        )
-
+        metrics, n_ambiguous = result
         metrics_list.append(metrics)
         print(f"  Raw length: {metrics['raw_length']}")
         print(f"  Trimmed length: {metrics['trimmed_length']}")
         print(f"  Mean quality: {metrics['mean_q']}")
+        if n_ambiguous is not None:
+            print(f"  Ambiguous calls in kept region: {n_ambiguous}")
         print()
 
     # Compute summary
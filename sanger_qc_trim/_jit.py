@@ -0,0 +1,24 @@
+"""Optional Numba JIT support.
+
+Numba is an optional dependency (``pip install ".[fast]"``). Without it,
+``njit`` returns functions unchanged and ``prange`` is ``range``, so
+callers can check ``HAVE_NUMBA`` and keep a NumPy code path.
+"""
+
+try:
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -6,11 +6,20 @@ intensity analysis from AB1 chromatogram files.
 """
 
 import logging
+import os
+import warnings
 import numpy as np
-from typing import Tuple, List, Dict, Any, Optional
+import pandas as pd
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Dict, Any, Iterator, Optional, Union
 from pathlib import Path
 from Bio import SeqIO
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+from ._jit import HAVE_NUMBA, njit
+from .io_utils import _abif_entries, parse_sequence_file
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +45,68 @@ IUPAC_REVERSE = {
     'N': ['A', 'C', 'G', 'T'],
 }
 
+# Fixed channel order used for all per-base intensity matrices
+BASES = ('A', 'C', 'G', 'T')
+
+# ASCII codes of BASES, indexed by channel
+BASE_CODES = np.frombuffer(''.join(BASES).encode('ascii'), dtype=np.uint8)
+
+# ASCII code of the no-call base
+N_CODE = ord('N')
+
+# Channel index of each base
+BASE_INDEX = {base: i for i, base in enumerate(BASES)}
+
+# IUPAC code (ASCII) for each channel pair, keyed by (primary << 2) | secondary;
+# 'N' on the diagonal
+IUPAC_LUT = np.full(len(BASES) * len(BASES), ord('N'), dtype=np.uint8)
+for _pair, _code in IUPAC_CODES.items():
+    _i, _j = (BASE_INDEX[b] for b in _pair)
+    IUPAC_LUT[(_i << 2) | _j] = IUPAC_LUT[(_j << 2) | _i] = ord(_code)
+
+# Call modes, indexed by the mode codes produced by the vectorized classifier
+CALL_MODES = ('N', 'single', 'ambiguous')
+MODE_N, MODE_SINGLE, MODE_AMBIGUOUS = 0, 1, 2
+
+# Flag lists, indexed by flag code
+FLAG_SETS = (
+    (),
+    ('low_quality',),
+    ('minor_secondary',),
+    ('heterozygous',),
+    ('unbalanced_mixture',),
+    ('uncertain_mixture',),
+    ('unclear_primary',),
+    ('low_quality', 'no_trace_data'),
+    ('no_trace_data',),
+    ('moderate_quality', 'no_trace_data'),
+    ('trimmed',),
+)
+(FLAG_NONE, FLAG_LOW_QUALITY, FLAG_MINOR_SECONDARY, FLAG_HETEROZYGOUS,
+ FLAG_UNBALANCED_MIXTURE, FLAG_UNCERTAIN_MIXTURE, FLAG_UNCLEAR_PRIMARY,
+ FLAG_LOW_QUALITY_NO_TRACE, FLAG_NO_TRACE, FLAG_MODERATE_QUALITY_NO_TRACE,
+ FLAG_TRIMMED) = range(11)
+
+# ABIF element type and tags used by the direct channel reader
+ABIF_SHORT = 4
+ABIF_TRACE_TAGS = {
+    (b'DATA', 9), (b'DATA', 10), (b'DATA', 11), (b'DATA', 12),
+    (b'PLOC', 1), (b'PLOC', 2),
+}
+
+# Number of AB1 files whose traces are kept by extract_traces
+TRACE_CACHE_SIZE = 64
+
+# Trace offsets sampled around each peak for the SNR noise baseline
+NOISE_OFFSETS = np.concatenate([np.arange(-20, -5), np.arange(5, 20)])
+
+# CLI-level caller options. Hashable and cheap to pickle, so it can be sent
+# to worker processes and used as a cache key; field names match the
+# create_ambiguous_caller keyword arguments.
+CallerConfig = namedtuple(
+    "CallerConfig", "clonal_context spr_noise_max spr_het_low spr_het_high"
+)
+
 
 @dataclass
 class AmbiguousCallingConfig:
@@ -58,6 +129,10 @@ class AmbiguousCallingConfig:
     # Intensity measurement parameters
     peak_window: int = 3           # Window size for peak integration (±bases)
 
+    # Work skipping
+    skip_low_quality: bool = False  # Emit Q < q_min_noise as N without intensity work
+    auto_trim_threshold: int = 20   # Quality threshold for trim_bounds='auto'
+
 
 @dataclass
 class BaseCall:
@@ -77,6 +152,233 @@ class BaseCall:
     flags: List[str]               # Additional flags/warnings
 
 
+@dataclass
+class BaseCallArray:
+    """Ambiguous base calls for a whole read, stored as parallel columns.
+
+    Bases are ASCII codes (uint8), call modes index into CALL_MODES and
+    flag codes index into FLAG_SETS. Integer indexing and iteration build
+    BaseCall views and slicing returns a BaseCallArray, so list-style code
+    keeps working; performance-sensitive code should read the columns.
+    """
+
+    position: np.ndarray           # 0-based positions
+    called_base: np.ndarray        # ASCII codes of final calls
+    primary_base: np.ndarray       # ASCII codes of primary bases
+    secondary_base: np.ndarray     # ASCII codes of secondary bases
+    primary_intensity: np.ndarray  # H1 (float32)
+    secondary_intensity: np.ndarray  # H2 (float32)
+    spr: np.ndarray                # Secondary-to-Primary Ratio (float32)
+    snr: np.ndarray                # Signal-to-Noise Ratio (float32)
+    quality: np.ndarray            # Phred quality scores (int16)
+    call_mode: np.ndarray          # Codes into CALL_MODES (int8)
+    allele_fraction: np.ndarray    # H1 / (H1 + H2) (float32)
+    flag_code: np.ndarray          # Codes into FLAG_SETS (int8)
+
+    def __len__(self) -> int:
+        return len(self.position)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BaseCall, 'BaseCallArray']:
+        if isinstance(index, slice):
+            return BaseCallArray(**{
+                f.name: getattr(self, f.name)[index] for f in fields(self)
+            })
+        return BaseCall(
+            position=int(self.position[index]),
+            called_base=chr(self.called_base[index]),
+            primary_base=chr(self.primary_base[index]),
+            secondary_base=chr(self.secondary_base[index]),
+            primary_intensity=float(self.primary_intensity[index]),
+            secondary_intensity=float(self.secondary_intensity[index]),
+            spr=float(self.spr[index]),
+            snr=float(self.snr[index]),
+            quality=int(self.quality[index]),
+            call_mode=CALL_MODES[self.call_mode[index]],
+            allele_fraction=float(self.allele_fraction[index]),
+            flags=list(FLAG_SETS[self.flag_code[index]])
+        )
+
+    def __iter__(self) -> Iterator[BaseCall]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def sequence(self) -> str:
+        """Called bases as a string (a single buffer copy)."""
+        return self.called_base.view(np.uint8).tobytes().decode('ascii')
+
+    @classmethod
+    def from_base_calls(cls, base_calls: List[BaseCall]) -> 'BaseCallArray':
+        """
+        Pack a list of BaseCall objects into columns.
+
+        Args:
+            base_calls: List of BaseCall objects
+
+        Returns:
+            Equivalent BaseCallArray
+        """
+        def codes(chars: str) -> np.ndarray:
+            return np.frombuffer(chars.encode('ascii'), dtype=np.uint8).copy()
+
+        return cls(
+            position=np.array([bc.position for bc in base_calls], dtype=np.int64),
+            called_base=codes(''.join(bc.called_base for bc in base_calls)),
+            primary_base=codes(''.join(bc.primary_base for bc in base_calls)),
+            secondary_base=codes(''.join(bc.secondary_base for bc in base_calls)),
+            primary_intensity=np.array(
+                [bc.primary_intensity for bc in base_calls], dtype=np.float32
+            ),
+            secondary_intensity=np.array(
+                [bc.secondary_intensity for bc in base_calls], dtype=np.float32
+            ),
+            spr=np.array([bc.spr for bc in base_calls], dtype=np.float32),
+            snr=np.array([bc.snr for bc in base_calls], dtype=np.float32),
+            quality=np.array([bc.quality for bc in base_calls], dtype=np.int16),
+            call_mode=np.array(
+                [CALL_MODES.index(bc.call_mode) for bc in base_calls], dtype=np.int8
+            ),
+            allele_fraction=np.array(
+                [bc.allele_fraction for bc in base_calls], dtype=np.float32
+            ),
+            flag_code=np.array(
+                [FLAG_SETS.index(tuple(bc.flags)) for bc in base_calls], dtype=np.int8
+            ),
+        )
+
+
+def _read_abif_channels(ab1_path: Path) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Read only the trace channels and peak locations from an ABIF file.
+
+    Args:
+        ab1_path: Path to .ab1 file
+
+    Returns:
+        Trace dictionary in the extract_traces layout, or None if the file
+        is not ABIF or any channel is missing
+    """
+    return _parse_abif_channels(Path(ab1_path).read_bytes())
+
+
+def _parse_abif_channels(data: bytes) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Extract the trace channels and peak locations from ABIF file contents.
+
+    Walks the ABIF directory for the DATA9-12 and PLOC2/PLOC1 entries
+    instead of building a full SeqRecord.
+
+    Args:
+        data: Raw .ab1 file contents
+
+    Returns:
+        Trace dictionary in the extract_traces layout, or None if the data
+        is not ABIF or any channel is missing
+    """
+    if data[:4] != b'ABIF':
+        return None
+
+    entries = {
+        key: np.frombuffer(data, dtype='>i2', count=num_elems, offset=data_offset)
+        for key, (elem_type, num_elems, data_offset) in _abif_entries(data, ABIF_TRACE_TAGS).items()
+        if elem_type == ABIF_SHORT
+    }
+
+    traces = {}
+    for base, number in zip(BASES, (9, 10, 11, 12)):
+        channel = entries.get((b'DATA', number))
+        if channel is None or len(channel) == 0:
+            return None
+        traces[base] = channel.astype(np.float32)
+
+    peak_locations = entries.get((b'PLOC', 2))
+    if peak_locations is None or len(peak_locations) == 0:
+        peak_locations = entries.get((b'PLOC', 1), np.zeros(0, dtype=np.int64))
+    traces['peak_locations'] = peak_locations.astype(int)
+
+    return traces
+
+
+def _load_traces(ab1_path: Path) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Read raw trace data from an AB1 file.
+
+    Uses the direct ABIF channel reader and falls back to BioPython when
+    that fails.
+
+    Args:
+        ab1_path: Path to .ab1 file
+
+    Returns:
+        Dictionary with keys 'A', 'C', 'G', 'T' mapping to intensity arrays,
+        or None if extraction fails
+    """
+    try:
+        traces = _read_abif_channels(ab1_path)
+        if traces is not None:
+            return traces
+    except Exception as e:
+        logger.debug(f"Direct ABIF read failed for {ab1_path}, using BioPython: {e}")
+
+    try:
+        record = SeqIO.read(str(ab1_path), "abi")
+
+        # Access raw trace data from AB1 annotations
+        # Channel mapping: DATA9='A', DATA10='C', DATA11='G', DATA12='T'
+        traces = {}
+
+        if hasattr(record, 'annotations') and 'abif_raw' in record.annotations:
+            abif_raw = record.annotations['abif_raw']
+
+            # Extract trace data for each channel
+            # Traces are ~12-bit instrument counts, so float32 is exact
+            traces['A'] = np.asarray(abif_raw.get('DATA9', []), dtype=np.float32)
+            traces['C'] = np.asarray(abif_raw.get('DATA10', []), dtype=np.float32)
+            traces['G'] = np.asarray(abif_raw.get('DATA11', []), dtype=np.float32)
+            traces['T'] = np.asarray(abif_raw.get('DATA12', []), dtype=np.float32)
+
+            # Get base positions (peak locations in trace)
+            peak_locations = abif_raw.get('PLOC2', [])
+            if not peak_locations:
+                peak_locations = abif_raw.get('PLOC1', [])
+
+            traces['peak_locations'] = np.array(peak_locations, dtype=int)
+
+            # Validate we got data
+            if all(len(traces[base]) > 0 for base in ['A', 'C', 'G', 'T']):
+                return traces
+
+        logger.warning(f"Could not extract trace data from {ab1_path}")
+        return None
+
+    except Exception as e:
+        logger.warning(f"Failed to extract traces from {ab1_path}: {e}")
+        return None
+
+
+class _TraceLoadError(Exception):
+    """Raised inside the trace cache so failed reads are not cached."""
+
+
+@lru_cache(maxsize=TRACE_CACHE_SIZE)
+def _load_traces_cached(resolved_path: str, mtime_ns: int) -> Dict[str, np.ndarray]:
+    """Cached _load_traces keyed by resolved path and modification time."""
+    traces = _load_traces(Path(resolved_path))
+    if traces is None:
+        raise _TraceLoadError(resolved_path)
+
+    # Cached arrays are shared between callers, so freeze them
+    for values in traces.values():
+        values.setflags(write=False)
+
+    return traces
+
+
+def clear_trace_cache() -> None:
+    """Drop all traces cached by PeakIntensityExtractor.extract_traces."""
+    _load_traces_cached.cache_clear()
+
+
 class PeakIntensityExtractor:
     """Extract peak intensities from AB1 chromatogram files."""
 
@@ -85,6 +387,11 @@ class PeakIntensityExtractor:
         """
         Extract raw trace data from AB1 file.
 
+        Results are cached per (resolved path, mtime), so repeated passes
+        over the same file skip the ABI parse. Failed reads are not cached.
+        The returned arrays are read-only; call clear_trace_cache() to drop
+        the cache.
+
         Args:
             ab1_path: Path to .ab1 file
 
@@ -93,45 +400,23 @@ class PeakIntensityExtractor:
             or None if extraction fails
         """
         try:
-            record = SeqIO.read(str(ab1_path), "abi")
-
-            # Access raw trace data from AB1 annotations
-            # Channel mapping: DATA9='A', DATA10='C', DATA11='G', DATA12='T'
-            traces = {}
-
-            if hasattr(record, 'annotations') and 'abif_raw' in record.annotations:
-                abif_raw = record.annotations['abif_raw']
-
-                # Extract trace data for each channel
-                traces['A'] = np.array(abif_raw.get('DATA9', []), dtype=float)
-                traces['C'] = np.array(abif_raw.get('DATA10', []), dtype=float)
-                traces['G'] = np.array(abif_raw.get('DATA11', []), dtype=float)
-                traces['T'] = np.array(abif_raw.get('DATA12', []), dtype=float)
-
-                # Get base positions (peak locations in trace)
-                peak_locations = abif_raw.get('PLOC2', [])
-                if not peak_locations:
-                    peak_locations = abif_raw.get('PLOC1', [])
-
-                traces['peak_locations'] = np.array(peak_locations, dtype=int)
+            resolved = Path(ab1_path).resolve()
+            mtime_ns = resolved.stat().st_mtime_ns
+        except OSError:
+            return _load_traces(ab1_path)
 
-                # Validate we got data
-                if all(len(traces[base]) > 0 for base in ['A', 'C', 'G', 'T']):
-                    return traces
-
-            logger.warning(f"Could not extract trace data from {ab1_path}")
-            return None
-
-        except Exception as e:
-            logger.warning(f"Failed to extract traces from {ab1_path}: {e}")
+        try:
+            return _load_traces_cached(str(resolved), mtime_ns)
+        except _TraceLoadError:
             return None
 
     @staticmethod
     def get_intensities_at_position(
         traces: Dict[str, np.ndarray],
         position: int,
-        window: int = 3
-    ) -> Dict[str, float]:
+        window: int = 3,
+        window_sums: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         Get peak intensities for all four bases at a specific position.
 
@@ -139,22 +424,29 @@ class PeakIntensityExtractor:
             traces: Dictionary of trace arrays for A/C/G/T
             position: Base position (0-based)
             window: Integration window size (±bases)
+            window_sums: Optional (4, n_peaks) result of precompute_window_sums;
+                when given, its column for the position is returned as a view
 
         Returns:
-            Dictionary mapping base -> integrated peak intensity
+            Array of shape (4,) with integrated peak intensities in BASES order
         """
+        if window_sums is not None:
+            if position >= window_sums.shape[1]:
+                return np.zeros(len(BASES), dtype=window_sums.dtype)
+            return window_sums[:, position]
+
         peak_locations = traces.get('peak_locations', [])
 
         if len(peak_locations) == 0 or position >= len(peak_locations):
             # No peak location data, return zeros
-            return {'A': 0.0, 'C': 0.0, 'G': 0.0, 'T': 0.0}
+            return np.zeros(len(BASES), dtype=np.float64)
 
         # Get trace position for this base call
         trace_pos = peak_locations[position]
 
         # Integrate intensities in a window around the peak
-        intensities = {}
-        for base in ['A', 'C', 'G', 'T']:
+        intensities = np.empty(len(BASES), dtype=np.float64)
+        for row, base in enumerate(BASES):
             trace = traces[base]
 
             # Define window bounds
@@ -162,10 +454,122 @@ class PeakIntensityExtractor:
             end = min(len(trace), trace_pos + window + 1)
 
             # Sum intensities in window (area under peak)
-            intensities[base] = float(np.sum(trace[start:end]))
+            intensities[row] = np.sum(trace[start:end])
 
         return intensities
 
+    @staticmethod
+    def precompute_window_sums(
+        traces: Dict[str, np.ndarray],
+        window: int = 3
+    ) -> np.ndarray:
+        """
+        Integrate peak intensities for every base position at once.
+
+        Uses a cumulative sum per channel so each window integral is a
+        single subtraction instead of a slice + sum per position. The
+        running sum is kept in float64 so long reads cannot lose precision;
+        the window integrals themselves are returned as float32.
+
+        Args:
+            traces: Dictionary of trace arrays for A/C/G/T
+            window: Integration window size (±bases)
+
+        Returns:
+            Array of shape (4, n_peaks) with rows ordered A, C, G, T
+        """
+        peak_locations = np.asarray(traces.get('peak_locations', []), dtype=np.int64)
+        sums = np.zeros((len(BASES), len(peak_locations)), dtype=np.float32)
+
+        if len(peak_locations) == 0:
+            return sums
+
+        for row, base in enumerate(BASES):
+            trace = traces[base]
+            csum = np.concatenate(([0.0], np.cumsum(trace, dtype=np.float64)))
+
+            starts = np.clip(peak_locations - window, 0, len(trace))
+            ends = np.clip(peak_locations + window + 1, 0, len(trace))
+            ends = np.maximum(ends, starts)
+
+            sums[row] = csum[ends] - csum[starts]
+
+        return sums
+
+
+@njit(cache=True)
+def _classify_batch(prim_idx, sec_idx, H1, H2, spr, snr, quality,
+                    thresholds, rule_mode, rule_flag, iupac_lut, base_codes):
+    """
+    Compiled per-position form of AmbiguousBaseCaller._classify.
+
+    Runs as one compiled loop when Numba is installed; the rule order and
+    comparisons match _apply_calling_criteria exactly. Reads are a few
+    hundred positions, so the loop is kept serial: thread start-up would
+    cost more than it saves, and a live thread pool breaks fork-based
+    worker pools such as batch_call_files.
+
+    Args:
+        prim_idx, sec_idx: Primary/secondary channel indices
+        H1, H2: Primary/secondary intensities
+        spr, snr: Secondary-to-Primary and Signal-to-Noise Ratios
+        quality: Phred quality scores
+        thresholds: Tuple from AmbiguousBaseCaller._thresholds
+        rule_mode, rule_flag: Per-rule call mode and flag codes
+        iupac_lut: IUPAC_LUT
+        base_codes: BASE_CODES
+
+    Returns:
+        Tuple of (called ASCII codes as uint8, call mode codes,
+        allele fractions, flag codes)
+    """
+    (q_min_noise, snr_min, spr_noise_max, spr_het_low, spr_het_high,
+     spr_unbalanced, q_confident, q_ambig) = thresholds
+
+    n = len(spr)
+    called = np.empty(n, dtype=np.uint8)
+    call_mode = np.empty(n, dtype=np.int8)
+    allele_frac = np.empty(n, dtype=np.float64)
+    flag_code = np.empty(n, dtype=np.int8)
+
+    for i in range(n):
+        h1 = np.float64(H1[i])
+        total = h1 + np.float64(H2[i])
+        allele_frac[i] = h1 / total if total > 0 else 0.0
+
+        q = quality[i]
+        s = spr[i]
+        r = snr[i]
+        ambig_quality = q >= q_ambig
+
+        if q < q_min_noise or r < snr_min:
+            rule = 1
+        elif q >= q_confident and s < spr_noise_max:
+            rule = 2
+        elif spr_noise_max <= s and s < spr_het_low and ambig_quality:
+            rule = 3
+        elif spr_het_low <= s and s <= spr_het_high and ambig_quality and r >= snr_min:
+            rule = 4
+        elif spr_het_high < s and s < spr_unbalanced and ambig_quality:
+            rule = 5
+        elif s >= spr_unbalanced:
+            rule = 6
+        else:
+            rule = 0
+
+        mode = rule_mode[rule]
+        call_mode[i] = mode
+        flag_code[i] = rule_flag[rule]
+
+        if mode == MODE_N:
+            called[i] = N_CODE
+        elif mode == MODE_AMBIGUOUS:
+            called[i] = iupac_lut[(prim_idx[i] << 2) | sec_idx[i]]
+        else:
+            called[i] = base_codes[prim_idx[i]]
+
+    return called, call_mode, allele_frac, flag_code
+
 
 class AmbiguousBaseCaller:
     """Perform ambiguous base calling using peak intensity analysis."""
@@ -180,12 +584,18 @@ class AmbiguousBaseCaller:
         self.config = config if config else AmbiguousCallingConfig()
         self.extractor = PeakIntensityExtractor()
 
+        # Scratch buffers for the SNR noise gather, grown on demand
+        self._noise_idx = np.empty((0, len(NOISE_OFFSETS)), dtype=np.int64)
+        self._noise_samples = np.empty((0, len(BASES) * len(NOISE_OFFSETS)), dtype=np.float32)
+
     def call_bases(
         self,
         ab1_path: Path,
         sequence: str,
-        qualities: List[int]
-    ) -> List[BaseCall]:
+        qualities: List[int],
+        trim_bounds: Union[Tuple[int, int], str, None] = None,
+        abi_data: Optional[bytes] = None,
+    ) -> BaseCallArray:
         """
         Perform ambiguous base calling on an AB1 file.
 
@@ -193,135 +603,323 @@ class AmbiguousBaseCaller:
             ab1_path: Path to .ab1 file
             sequence: Called sequence string
             qualities: List of Phred quality scores
+            trim_bounds: Optional (start, end) kept region, e.g. from
+                apply_trim; positions outside it are emitted as N with the
+                'trimmed' flag and skip all intensity work. 'auto' keeps
+                (0, erne_trim_end(qualities, config.auto_trim_threshold))
+            abi_data: Contents of ab1_path if the caller already read it
+                (see parse_sequence_file(..., with_raw=True)); the traces
+                are then taken from it without touching the file again
 
         Returns:
-            List of BaseCall objects, one per position
+            BaseCallArray with one entry per position
         """
         # Extract trace data
-        traces = self.extractor.extract_traces(ab1_path)
+        traces = None
+        if abi_data is not None:
+            try:
+                traces = _parse_abif_channels(abi_data)
+            except Exception as e:
+                logger.debug(f"Could not read traces from preloaded {ab1_path}: {e}")
+        if traces is None:
+            traces = self.extractor.extract_traces(ab1_path)
 
         if traces is None:
             # Fall back to simple quality-based calling
             logger.warning(f"Using fallback calling for {ab1_path} (no trace data)")
             return self._fallback_calling(sequence, qualities)
 
-        # Process each position
-        base_calls = []
-        for pos in range(len(sequence)):
-            base_call = self._call_position(
-                position=pos,
-                original_base=sequence[pos],
-                quality=qualities[pos] if pos < len(qualities) else 0,
-                traces=traces
-            )
-            base_calls.append(base_call)
+        # Qualities shorter than the sequence are padded with Q0
+        n = len(sequence)
+        quality = np.zeros(n, dtype=np.int16)
+        n_quals = min(n, len(qualities))
+        quality[:n_quals] = qualities[:n_quals]
+
+        # Positions that get the full intensity/SNR treatment; the rest are
+        # emitted as trimmed or low-quality Ns without touching the traces
+        if trim_bounds is None:
+            start, end = 0, n
+        elif trim_bounds == 'auto':
+            start, end = 0, self.erne_trim_end(quality, self.config.auto_trim_threshold)
+        else:
+            start, end = trim_bounds
+        start, end = max(0, min(start, n)), max(0, min(end, n))
+        active = np.arange(start, max(start, end))
+        if self.config.skip_low_quality:
+            active = active[quality[active] >= self.config.q_min_noise]
+
+        # Skipped positions keep the read's base as primary and no signal
+        result = BaseCallArray(
+            position=np.arange(n, dtype=np.int64),
+            called_base=np.full(n, N_CODE, dtype=np.uint8),
+            primary_base=np.frombuffer(sequence.encode('ascii'), dtype=np.uint8).copy(),
+            secondary_base=np.full(n, N_CODE, dtype=np.uint8),
+            primary_intensity=np.zeros(n, dtype=np.float32),
+            secondary_intensity=np.zeros(n, dtype=np.float32),
+            spr=np.zeros(n, dtype=np.float32),
+            snr=np.zeros(n, dtype=np.float32),
+            quality=quality,
+            call_mode=np.full(n, MODE_N, dtype=np.int8),
+            allele_fraction=np.zeros(n, dtype=np.float32),
+            flag_code=np.full(n, FLAG_LOW_QUALITY, dtype=np.int8)
+        )
 
-        return base_calls
+        result.flag_code[:start] = FLAG_TRIMMED
+        result.flag_code[max(start, end):] = FLAG_TRIMMED
 
-    def _call_position(
-        self,
-        position: int,
-        original_base: str,
-        quality: int,
-        traces: Dict[str, np.ndarray]
-    ) -> BaseCall:
+        self._call_active(traces, active, result)
+
+        return result
+
+    @staticmethod
+    def erne_trim_end(qualities: np.ndarray, threshold: int) -> int:
         """
-        Call a single base position using the 6-rule criteria.
+        Find the 3' trim end with a running-sum (ERNE-style) quality trimmer.
+
+        The kept prefix is the one maximizing sum(q - threshold), found with
+        one cumulative sum instead of a Python scan.
 
         Args:
-            position: 0-based position
-            original_base: Original base call from sequencer
-            quality: Phred quality score
-            traces: Trace data dictionary
+            qualities: Phred quality scores
+            threshold: Quality threshold
 
         Returns:
-            BaseCall object with full annotation
+            End of the kept prefix (exclusive); 0 if no prefix scores above 0
         """
-        # Get intensities at this position
-        intensities = self.extractor.get_intensities_at_position(
-            traces, position, self.config.peak_window
-        )
+        q = np.asarray(qualities, dtype=np.int32)
+        if len(q) == 0:
+            return 0
 
-        # Sort bases by intensity
-        sorted_bases = sorted(
-            intensities.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        running = np.cumsum(q - threshold)
+        best = int(np.argmax(running))
+        return best + 1 if running[best] > 0 else 0
 
-        b1, H1 = sorted_bases[0]  # Primary base
-        b2, H2 = sorted_bases[1]  # Secondary base
-
-        # Calculate metrics
-        spr = H2 / H1 if H1 > 0 else 0.0
-        snr = self._calculate_snr(traces, position, H1)
+    def _call_active(
+        self,
+        traces: Dict[str, np.ndarray],
+        active: np.ndarray,
+        result: BaseCallArray
+    ) -> None:
+        """
+        Run intensity-based calling on a subset of positions.
 
-        # Apply the 6 default calling criteria
-        called_base, call_mode, allele_frac, flags = self._apply_calling_criteria(
-            b1, b2, H1, H2, spr, snr, quality
+        Args:
+            traces: Trace data dictionary
+            active: Sorted positions to call
+            result: BaseCallArray whose active entries are filled in place
+        """
+        if len(active) == 0:
+            return
+
+        # Restrict the traces to the peaks of the active positions; positions
+        # past the last peak location form a suffix and keep zero intensity
+        peak_locations = traces['peak_locations']
+        with_peak = active[active < len(peak_locations)]
+        if len(with_peak) < len(peak_locations):
+            traces = dict(traces, peak_locations=peak_locations[with_peak])
+
+        # Integrate all peak windows up front
+        window_sums = self.extractor.precompute_window_sums(
+            traces, self.config.peak_window
         )
+        intensities = np.zeros((len(BASES), len(active)), dtype=np.float32)
+        intensities[:, :len(with_peak)] = window_sums
+
+        # Rank channels once for the whole read; a stable sort keeps the
+        # A, C, G, T order for tied intensities
+        order = np.argsort(-intensities, axis=0, kind='stable')
+        prim_idx, sec_idx = order[0], order[1]
+        H1 = np.take_along_axis(intensities, prim_idx[None], 0)[0]
+        H2 = np.take_along_axis(intensities, sec_idx[None], 0)[0]
+        # Ratios stay float64 while classifying so thresholds such as
+        # spr < 0.20 are not shifted by float32 rounding
+        spr = np.divide(
+            H2, H1, out=np.zeros(len(H1), dtype=np.float64), where=H1 > 0,
+            dtype=np.float64
+        )
+        snr = self._calculate_snr(traces, H1)
+        quality = result.quality[active]
 
-        return BaseCall(
-            position=position,
-            called_base=called_base,
-            primary_base=b1,
-            secondary_base=b2,
-            primary_intensity=H1,
-            secondary_intensity=H2,
-            spr=spr,
-            snr=snr,
-            quality=quality,
-            call_mode=call_mode,
-            allele_fraction=allele_frac,
-            flags=flags
+        # Apply the 6 default calling criteria to every position at once
+        called, call_mode, allele_frac, flag_code = self._classify(
+            prim_idx, sec_idx, H1, H2, spr, snr, quality
         )
 
+        result.called_base[active] = called
+        result.primary_base[active] = BASE_CODES[prim_idx]
+        result.secondary_base[active] = BASE_CODES[sec_idx]
+        result.primary_intensity[active] = H1
+        result.secondary_intensity[active] = H2
+        result.spr[active] = spr
+        result.snr[active] = snr
+        result.call_mode[active] = call_mode
+        result.allele_fraction[active] = allele_frac
+        result.flag_code[active] = flag_code
+
     def _calculate_snr(
         self,
         traces: Dict[str, np.ndarray],
-        position: int,
-        signal: float
-    ) -> float:
+        signal: np.ndarray
+    ) -> np.ndarray:
         """
-        Calculate signal-to-noise ratio at a position.
+        Calculate signal-to-noise ratio for every position.
+
+        Noise is the median baseline of all four channels sampled 5-20 trace
+        points either side of each peak, gathered for all peaks at once.
 
         Args:
             traces: Trace data dictionary
-            position: Base position
-            signal: Primary signal intensity (H1)
+            signal: Primary signal intensity (H1) per position
 
         Returns:
-            SNR value
+            Array of SNR values (0.0 where no noise estimate is available)
         """
-        peak_locations = traces.get('peak_locations', [])
+        snr = np.zeros(len(signal), dtype=np.float64)
+        peak_locations = np.asarray(traces.get('peak_locations', []), dtype=np.int64)
+        n = min(len(signal), len(peak_locations))
 
-        if len(peak_locations) == 0 or position >= len(peak_locations):
-            return 0.0
+        if n == 0:
+            return snr
 
-        trace_pos = peak_locations[position]
+        idx_buf, samples_buf = self._snr_scratch(n)
 
-        # Estimate noise from local baseline
-        # Use median of minimum values in surrounding regions
-        noise_samples = []
-        for base in ['A', 'C', 'G', 'T']:
-            trace = traces[base]
+        # Trace indices of the noise windows, one row per peak
+        idx = np.add(peak_locations[:n, None], NOISE_OFFSETS[None, :], out=idx_buf[:n])
+        width = len(NOISE_OFFSETS)
+
+        # Gather straight into the scratch matrix; out-of-range samples are
+        # NaN so they drop out of the median
+        samples = samples_buf[:n]
+        for row, base in enumerate(BASES):
+            trace = np.asarray(traces[base], dtype=np.float32)
+            block = samples[:, row * width:(row + 1) * width]
+            if len(trace) == 0:
+                block.fill(np.nan)
+                continue
+            np.take(trace, idx, mode='clip', out=block)
+            block[(idx < 0) | (idx >= len(trace))] = np.nan
+
+        has_noise = ~np.isnan(samples).all(axis=1)
+        noise = np.zeros(n, dtype=np.float64)
+        noise[has_noise] = np.nanmedian(samples[has_noise], axis=1)
+
+        positive = noise > 0
+        snr[:n][positive] = signal[:n][positive] / noise[positive]
+
+        return snr
+
+    def _snr_scratch(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return reusable index and sample buffers with room for n peaks.
+
+        The buffers grow to the longest read seen and are reused across
+        calls, so a caller instance should not be shared between threads.
+
+        Args:
+            n: Number of peaks needed
+
+        Returns:
+            Tuple of (index buffer, sample buffer), each with at least n rows
+        """
+        if self._noise_samples.shape[0] < n:
+            rows = max(n, 2 * self._noise_samples.shape[0])
+            self._noise_idx = np.empty((rows, len(NOISE_OFFSETS)), dtype=np.int64)
+            self._noise_samples = np.empty(
+                (rows, len(BASES) * len(NOISE_OFFSETS)), dtype=np.float32
+            )
+        return self._noise_idx, self._noise_samples
+
+    def _classify(
+        self,
+        prim_idx: np.ndarray,
+        sec_idx: np.ndarray,
+        H1: np.ndarray,
+        H2: np.ndarray,
+        spr: np.ndarray,
+        snr: np.ndarray,
+        quality: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized form of _apply_calling_criteria over whole arrays.
+
+        Each position is assigned the first of the 6 rules it matches, and
+        the rule number is then mapped to a call mode and flag code.
+
+        Args:
+            prim_idx: Primary channel index per position (0-3 for A/C/G/T)
+            sec_idx: Secondary channel index per position
+            H1: Primary intensities
+            H2: Secondary intensities
+            spr: Secondary-to-Primary Ratios
+            snr: Signal-to-Noise Ratios
+            quality: Phred quality scores
+
+        Returns:
+            Tuple of (called ASCII codes as uint8, call mode codes,
+            allele fractions, flag codes)
+        """
+        cfg = self.config
+
+        # Per-rule outcome tables; index 0 is the final primary-base fallback
+        if cfg.clonal_context:
+            rule_mode = [MODE_SINGLE, MODE_N, MODE_SINGLE, MODE_SINGLE,
+                         MODE_AMBIGUOUS, MODE_SINGLE, MODE_N]
+            rule_flag = [FLAG_NONE, FLAG_LOW_QUALITY, FLAG_NONE, FLAG_MINOR_SECONDARY,
+                         FLAG_HETEROZYGOUS, FLAG_UNCERTAIN_MIXTURE, FLAG_UNCLEAR_PRIMARY]
+        else:
+            rule_mode = [MODE_SINGLE, MODE_N, MODE_SINGLE, MODE_AMBIGUOUS,
+                         MODE_AMBIGUOUS, MODE_AMBIGUOUS, MODE_N]
+            rule_flag = [FLAG_NONE, FLAG_LOW_QUALITY, FLAG_NONE, FLAG_NONE,
+                         FLAG_HETEROZYGOUS, FLAG_UNBALANCED_MIXTURE, FLAG_UNCLEAR_PRIMARY]
+        rule_mode = np.array(rule_mode, dtype=np.int8)
+        rule_flag = np.array(rule_flag, dtype=np.int8)
+
+        if HAVE_NUMBA:
+            return _classify_batch(
+                prim_idx, sec_idx, H1, H2, spr, snr, quality,
+                self._thresholds(), rule_mode, rule_flag, IUPAC_LUT, BASE_CODES
+            )
+
+        total_signal = H1.astype(np.float64) + H2
+        allele_frac = np.divide(
+            H1, total_signal, out=np.zeros_like(total_signal), where=total_signal > 0
+        )
 
-            # Sample regions before and after peak
-            before_start = max(0, trace_pos - 20)
-            before_end = max(0, trace_pos - 5)
-            after_start = min(len(trace), trace_pos + 5)
-            after_end = min(len(trace), trace_pos + 20)
+        ambig_quality = quality >= cfg.q_ambig
+        rule = np.select(
+            [
+                (quality < cfg.q_min_noise) | (snr < cfg.snr_min),
+                (quality >= cfg.q_confident) & (spr < cfg.spr_noise_max),
+                (cfg.spr_noise_max <= spr) & (spr < cfg.spr_het_low) & ambig_quality,
+                ((cfg.spr_het_low <= spr) & (spr <= cfg.spr_het_high) & ambig_quality &
+                 (snr >= cfg.snr_min)),
+                (cfg.spr_het_high < spr) & (spr < cfg.spr_unbalanced) & ambig_quality,
+                spr >= cfg.spr_unbalanced,
+            ],
+            [1, 2, 3, 4, 5, 6],
+            default=0
+        )
+
+        call_mode = rule_mode[rule]
+        flag_code = rule_flag[rule]
 
-            if before_end > before_start:
-                noise_samples.extend(trace[before_start:before_end])
-            if after_end > after_start:
-                noise_samples.extend(trace[after_start:after_end])
+        called = np.where(
+            call_mode == MODE_AMBIGUOUS,
+            IUPAC_LUT[(prim_idx << 2) | sec_idx],
+            BASE_CODES[prim_idx]
+        )
+        called[call_mode == MODE_N] = ord('N')
 
-        if noise_samples:
-            noise = float(np.median(noise_samples))
-            return signal / noise if noise > 0 else 0.0
+        return called, call_mode, allele_frac, flag_code
 
-        return 0.0
+    def _thresholds(self) -> Tuple[float, ...]:
+        """Calling thresholds as a flat float tuple for _classify_batch."""
+        cfg = self.config
+        return (
+            float(cfg.q_min_noise), float(cfg.snr_min), float(cfg.spr_noise_max),
+            float(cfg.spr_het_low), float(cfg.spr_het_high), float(cfg.spr_unbalanced),
+            float(cfg.q_confident), float(cfg.q_ambig),
+        )
 
     def _apply_calling_criteria(
         self,
@@ -421,14 +1019,17 @@ class AmbiguousBaseCaller:
         Returns:
             IUPAC ambiguity code or 'N' if not found
         """
-        base_set = frozenset([base1.upper(), base2.upper()])
-        return IUPAC_CODES.get(base_set, 'N')
+        i = BASE_INDEX.get(base1.upper())
+        j = BASE_INDEX.get(base2.upper())
+        if i is None or j is None:
+            return 'N'
+        return chr(IUPAC_LUT[(i << 2) | j])
 
     def _fallback_calling(
         self,
         sequence: str,
         qualities: List[int]
-    ) -> List[BaseCall]:
+    ) -> BaseCallArray:
         """
         Fallback to quality-based calling when trace data unavailable.
 
@@ -437,87 +1038,180 @@ class AmbiguousBaseCaller:
             qualities: List of Phred quality scores
 
         Returns:
-            List of BaseCall objects with limited information
-        """
-        base_calls = []
-
-        for pos, base in enumerate(sequence):
-            qual = qualities[pos] if pos < len(qualities) else 0
-
-            # Simple quality-based decision
-            if qual < self.config.q_min_noise:
-                called = 'N'
-                mode = 'N'
-                flags = ['low_quality', 'no_trace_data']
-            elif qual >= self.config.q_confident:
-                called = base
-                mode = 'single'
-                flags = ['no_trace_data']
-            else:
-                called = base
-                mode = 'single'
-                flags = ['moderate_quality', 'no_trace_data']
-
-            base_calls.append(BaseCall(
-                position=pos,
-                called_base=called,
-                primary_base=base,
-                secondary_base='N',
-                primary_intensity=0.0,
-                secondary_intensity=0.0,
-                spr=0.0,
-                snr=0.0,
-                quality=qual,
-                call_mode=mode,
-                allele_fraction=1.0,
-                flags=flags
-            ))
-
-        return base_calls
+            BaseCallArray with limited information
+        """
+        n = len(sequence)
+        bases = np.frombuffer(sequence.encode('ascii'), dtype=np.uint8)
+
+        # Qualities shorter than the sequence are padded with Q0
+        quality = np.zeros(n, dtype=np.int16)
+        n_quals = min(n, len(qualities))
+        quality[:n_quals] = qualities[:n_quals]
+
+        # Simple quality-based decision: N / confident / moderate
+        low = quality < self.config.q_min_noise
+        flag_code = np.where(
+            low,
+            FLAG_LOW_QUALITY_NO_TRACE,
+            np.where(quality >= self.config.q_confident,
+                     FLAG_NO_TRACE, FLAG_MODERATE_QUALITY_NO_TRACE)
+        ).astype(np.int8)
+
+        return BaseCallArray(
+            position=np.arange(n, dtype=np.int64),
+            called_base=np.where(low, N_CODE, bases).astype(np.uint8),
+            primary_base=bases.copy(),
+            secondary_base=np.full(n, N_CODE, dtype=np.uint8),
+            primary_intensity=np.zeros(n, dtype=np.float32),
+            secondary_intensity=np.zeros(n, dtype=np.float32),
+            spr=np.zeros(n, dtype=np.float32),
+            snr=np.zeros(n, dtype=np.float32),
+            quality=quality,
+            call_mode=np.where(low, MODE_N, MODE_SINGLE).astype(np.int8),
+            allele_fraction=np.ones(n, dtype=np.float32),
+            flag_code=flag_code
+        )
 
     @staticmethod
-    def base_calls_to_sequence(base_calls: List[BaseCall]) -> str:
+    def base_calls_to_sequence(base_calls: Union[BaseCallArray, List[BaseCall]]) -> str:
         """
-        Convert list of BaseCall objects to sequence string.
+        Convert base calls to sequence string.
 
         Args:
-            base_calls: List of BaseCall objects
+            base_calls: BaseCallArray or list of BaseCall objects
 
         Returns:
             Sequence string with IUPAC codes
         """
+        if isinstance(base_calls, BaseCallArray):
+            return base_calls.sequence
+
+        warnings.warn(
+            "Passing a list of BaseCall objects to base_calls_to_sequence is "
+            "deprecated; pass the BaseCallArray returned by call_bases",
+            DeprecationWarning,
+            stacklevel=2
+        )
         return ''.join(bc.called_base for bc in base_calls)
 
     @staticmethod
-    def base_calls_to_annotations(base_calls: List[BaseCall]) -> List[Dict[str, Any]]:
+    def iter_annotations(
+        base_calls: Union[BaseCallArray, List[BaseCall]]
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Convert BaseCall objects to annotation dictionaries for output.
+        Yield one annotation dictionary per position.
 
         Args:
-            base_calls: List of BaseCall objects
+            base_calls: BaseCallArray or list of BaseCall objects
+
+        Yields:
+            Annotation dictionaries in position order
+        """
+        if not isinstance(base_calls, BaseCallArray):
+            for bc in base_calls:
+                yield {
+                    'position': bc.position,
+                    'called_base': bc.called_base,
+                    'primary_base': bc.primary_base,
+                    'secondary_base': bc.secondary_base,
+                    'primary_intensity': round(bc.primary_intensity, 2),
+                    'secondary_intensity': round(bc.secondary_intensity, 2),
+                    'spr': round(bc.spr, 4),
+                    'snr': round(bc.snr, 2),
+                    'quality': bc.quality,
+                    'call_mode': bc.call_mode,
+                    'allele_fraction': round(bc.allele_fraction, 4),
+                    'flags': ','.join(bc.flags) if bc.flags else ''
+                }
+            return
+
+        columns = AmbiguousBaseCaller._annotation_columns(base_calls)
+        names = list(columns)
+        for row in zip(*columns.values()):
+            yield dict(zip(names, row))
+
+    @staticmethod
+    def annotations_table(base_calls: Union[BaseCallArray, List[BaseCall]]) -> pd.DataFrame:
+        """
+        Build the per-position annotations as a DataFrame.
+
+        For a BaseCallArray the frame is built straight from its columns,
+        without creating a dictionary per position.
+
+        Args:
+            base_calls: BaseCallArray or list of BaseCall objects
+
+        Returns:
+            DataFrame with one row per position
+        """
+        if not isinstance(base_calls, BaseCallArray):
+            return pd.DataFrame(list(AmbiguousBaseCaller.iter_annotations(base_calls)))
+        return pd.DataFrame(AmbiguousBaseCaller._annotation_columns(base_calls))
+
+    @staticmethod
+    def _annotation_columns(base_calls: BaseCallArray) -> Dict[str, list]:
+        """Rounded annotation columns of a BaseCallArray, as Python lists."""
+        def rounded(values: np.ndarray, decimals: int) -> list:
+            return np.round(values.astype(np.float64), decimals).tolist()
+
+        flag_strings = [','.join(flags) for flags in FLAG_SETS]
+
+        return {
+            'position': base_calls.position.tolist(),
+            'called_base': list(base_calls.called_base.tobytes().decode('ascii')),
+            'primary_base': list(base_calls.primary_base.tobytes().decode('ascii')),
+            'secondary_base': list(base_calls.secondary_base.tobytes().decode('ascii')),
+            'primary_intensity': rounded(base_calls.primary_intensity, 2),
+            'secondary_intensity': rounded(base_calls.secondary_intensity, 2),
+            'spr': rounded(base_calls.spr, 4),
+            'snr': rounded(base_calls.snr, 2),
+            'quality': base_calls.quality.tolist(),
+            'call_mode': [CALL_MODES[mode] for mode in base_calls.call_mode.tolist()],
+            'allele_fraction': rounded(base_calls.allele_fraction, 4),
+            'flags': [flag_strings[code] for code in base_calls.flag_code.tolist()],
+        }
+
+    @staticmethod
+    def base_calls_to_annotations(
+        base_calls: Union[BaseCallArray, List[BaseCall]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert base calls to annotation dictionaries for output.
+
+        Prefer iter_annotations or annotations_table for large reads.
+
+        Args:
+            base_calls: BaseCallArray or list of BaseCall objects
 
         Returns:
             List of annotation dictionaries
         """
-        annotations = []
+        return list(AmbiguousBaseCaller.iter_annotations(base_calls))
 
-        for bc in base_calls:
-            annotations.append({
-                'position': bc.position,
-                'called_base': bc.called_base,
-                'primary_base': bc.primary_base,
-                'secondary_base': bc.secondary_base,
-                'primary_intensity': round(bc.primary_intensity, 2),
-                'secondary_intensity': round(bc.secondary_intensity, 2),
-                'spr': round(bc.spr, 4),
-                'snr': round(bc.snr, 2),
-                'quality': bc.quality,
-                'call_mode': bc.call_mode,
-                'allele_fraction': round(bc.allele_fraction, 4),
-                'flags': ','.join(bc.flags) if bc.flags else ''
-            })
+    @staticmethod
+    def base_calls_to_sequence_and_annotations(
+        base_calls: Union[BaseCallArray, List[BaseCall]]
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Build the sequence string and annotation dictionaries together.
+
+        A list of BaseCall objects is walked once for both outputs.
+
+        Args:
+            base_calls: BaseCallArray or list of BaseCall objects
 
-        return annotations
+        Returns:
+            Tuple of (sequence string with IUPAC codes, annotation dictionaries)
+        """
+        if isinstance(base_calls, BaseCallArray):
+            return base_calls.sequence, AmbiguousBaseCaller.base_calls_to_annotations(base_calls)
+
+        bases = []
+        annotations = []
+        for annotation in AmbiguousBaseCaller.iter_annotations(base_calls):
+            bases.append(annotation['called_base'])
+            annotations.append(annotation)
+        return ''.join(bases), annotations
 
 
 def create_ambiguous_caller(
@@ -555,3 +1249,63 @@ def create_ambiguous_caller(
     )
 
     return AmbiguousBaseCaller(config)
+
+
+# Per-process caller used by batch_call_files workers
+_worker_caller: Optional[AmbiguousBaseCaller] = None
+
+
+def _init_batch_worker(config: AmbiguousCallingConfig) -> None:
+    """Build the caller once per worker process."""
+    global _worker_caller
+    _worker_caller = AmbiguousBaseCaller(config)
+
+
+def _call_one_file(ab1_path: Path) -> Optional[BaseCallArray]:
+    """Parse one AB1 file and run ambiguous calling on it."""
+    result = parse_sequence_file(ab1_path, "ab1")
+    if result is None:
+        return None
+
+    seq, quals = result
+    try:
+        return _worker_caller.call_bases(ab1_path, seq, quals)
+    except Exception as e:
+        logger.warning(f"Ambiguous calling failed for {ab1_path}: {e}")
+        return None
+
+
+def batch_call_files(
+    paths: List[Path],
+    config: Optional[AmbiguousCallingConfig] = None,
+    max_workers: Optional[int] = None,
+    chunksize: int = 4
+) -> List[Optional[BaseCallArray]]:
+    """
+    Run ambiguous calling on many AB1 files in parallel worker processes.
+
+    Each file is parsed and called independently, so the work is split
+    across processes; results come back in the order of ``paths``.
+
+    Args:
+        paths: AB1 files to process
+        config: Calling configuration (uses defaults if None)
+        max_workers: Number of worker processes (defaults to CPU count)
+        chunksize: Number of files handed to a worker at a time
+
+    Returns:
+        List with a BaseCallArray per file, or None where parsing or
+        calling failed
+    """
+    if not paths:
+        return []
+
+    config = config if config else AmbiguousCallingConfig()
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(paths)),
+        initializer=_init_batch_worker,
+        initargs=(config,)
+    ) as executor:
+        return list(executor.map(_call_one_file, paths, chunksize=chunksize))
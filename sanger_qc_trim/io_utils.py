@@ -1,16 +1,32 @@
 """I/O utilities for file discovery, format detection, and sequence parsing."""
 
+import hashlib
+import io
 import logging
 import os
+import pickle
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Union
+import numpy as np
 from Bio import SeqIO
 from Bio.SeqRecord import SeqRecord
 
+from . import __version__
+
 logger = logging.getLogger(__name__)
 
+# ABIF directory entry size; payloads of 4 bytes or less sit in its offset field
+ABIF_DIR_ENTRY_SIZE = 28
+
 
-def discover_files(inputs: List[str], recursive: bool = False) -> List[Tuple[Path, str]]:
+def discover_files(
+    inputs: List[str],
+    recursive: bool = False,
+    cache_dir: Optional[Path] = None,
+) -> List[Tuple[Path, str]]:
     """
     Discover all .ab1 and .phd.1 files from input paths.
 
@@ -19,122 +35,279 @@ def discover_files(inputs: List[str], recursive: bool = False) -> List[Tuple[Pat
     Args:
         inputs: List of file or directory paths
         recursive: Whether to recursively search directories
+        cache_dir: If given and every input is a directory, keep a manifest
+            of the result there and reuse it while none of the walked
+            directories has changed
 
     Returns:
         List of tuples (file_path, format) where format is 'ab1' or 'phd.1'
     """
-    files = []
-    seen_samples = {}  # Track sample_id -> (path, format) for deduplication
+    manifest_path = None
+    dir_stamps = None
+    if cache_dir is not None and inputs and all(os.path.isdir(p) for p in inputs):
+        manifest_path = _discovery_manifest_path(cache_dir, inputs, recursive)
+        cached = _load_discovery_manifest(manifest_path)
+        if cached is not None:
+            logger.info("Discovered %d files to process (inputs unchanged since last run)", len(cached))
+            return cached
+        dir_stamps = []
+
+    # Track sample_id -> (path, format) for deduplication. Directory entries
+    # are kept as plain strings and only the surviving ones become Paths.
+    seen_samples = {}
+    total_files = 0
+    phd_superseded = 0  # .phd.1 files dropped in favour of an .ab1
+
+    def add(file_path: Union[str, Path], fmt: str, sample_id: str) -> None:
+        # Deduplicate by sample_id as files are found (prefer .ab1 over .phd.1).
+        # Expected ab1/phd pairs are only counted here and summarized once
+        # below; genuine duplicates still warn individually.
+        nonlocal total_files, phd_superseded
+        total_files += 1
+
+        if sample_id not in seen_samples:
+            seen_samples[sample_id] = (file_path, fmt)
+        else:
+            # If we already have this sample_id, prefer .ab1 format
+            existing_path, existing_fmt = seen_samples[sample_id]
+            if fmt == "ab1" and existing_fmt == "phd.1":
+                logger.debug("Replacing %s with %s (preferring .ab1)",
+                             _file_name(existing_path), _file_name(file_path))
+                seen_samples[sample_id] = (file_path, fmt)
+                phd_superseded += 1
+            elif fmt == "phd.1" and existing_fmt == "ab1":
+                logger.debug("Skipping %s (already have .ab1 version)", _file_name(file_path))
+                phd_superseded += 1
+            else:
+                logger.warning("Duplicate sample_id '%s': %s and %s",
+                               sample_id, _file_name(existing_path), _file_name(file_path))
 
     for input_path in inputs:
         path = Path(input_path)
 
         if path.is_file():
-            fmt = detect_format(path)
+            fmt, sample_id = _classify(path.name)
             if fmt:
-                files.append((path, fmt))
+                add(path, fmt, sample_id)
             else:
-                logger.warning(f"Skipping file with unknown format: {path}")
+                logger.warning("Skipping file with unknown format: %s", path)
 
         elif path.is_dir():
-            if recursive:
-                pattern = "**/*"
-            else:
-                pattern = "*"
-
-            for file_path in path.glob(pattern):
-                if file_path.is_file():
-                    fmt = detect_format(file_path)
-                    if fmt:
-                        files.append((file_path, fmt))
+            if dir_stamps is not None:
+                dir_stamps.append((str(path), os.stat(path).st_mtime_ns))
+            for entry_path, entry_name in _iter_files(str(path), recursive, dir_stamps):
+                fmt, sample_id = _classify(entry_name)
+                if fmt:
+                    add(entry_path, fmt, sample_id)
 
         else:
-            logger.warning(f"Input path does not exist: {path}")
+            logger.warning("Input path does not exist: %s", path)
 
-    # Deduplicate by sample_id (prefer .ab1 over .phd.1)
-    for file_path, fmt in files:
-        sample_id = get_sample_id(file_path)
+    deduplicated_files = [
+        (file_path if isinstance(file_path, Path) else Path(file_path), fmt)
+        for file_path, fmt in seen_samples.values()
+    ]
 
-        if sample_id not in seen_samples:
-            seen_samples[sample_id] = (file_path, fmt)
-        else:
-            # If we already have this sample_id, prefer .ab1 format
-            existing_path, existing_fmt = seen_samples[sample_id]
-            if fmt == "ab1" and existing_fmt == "phd.1":
-                logger.info(f"Replacing {existing_path.name} with {file_path.name} (preferring .ab1)")
-                seen_samples[sample_id] = (file_path, fmt)
-            elif fmt == "phd.1" and existing_fmt == "ab1":
-                logger.info(f"Skipping {file_path.name} (already have .ab1 version)")
-            else:
-                logger.warning(f"Duplicate sample_id '{sample_id}': {existing_path.name} and {file_path.name}")
+    if phd_superseded:
+        logger.info("Using .ab1 instead of .phd.1 for %d samples", phd_superseded)
+
+    if len(deduplicated_files) < total_files:
+        logger.info("Deduplicated %d files to %d unique samples", total_files, len(deduplicated_files))
 
-    deduplicated_files = list(seen_samples.values())
+    logger.info("Discovered %d files to process", len(deduplicated_files))
 
-    if len(deduplicated_files) < len(files):
-        logger.info(f"Deduplicated {len(files)} files to {len(deduplicated_files)} unique samples")
+    if manifest_path is not None:
+        _save_discovery_manifest(manifest_path, dir_stamps, deduplicated_files)
 
-    logger.info(f"Discovered {len(deduplicated_files)} files to process")
     return deduplicated_files
 
 
-def detect_format(file_path: Path) -> Optional[str]:
+def _discovery_manifest_path(cache_dir: Path, inputs: List[str], recursive: bool) -> Path:
+    """Manifest file for discover_files on ``inputs`` under ``cache_dir``."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(repr(([(p, os.path.abspath(p)) for p in inputs], recursive)).encode())
+    h.update(__version__.encode())
+    return Path(cache_dir) / "discover" / f"{h.hexdigest()}.pkl"
+
+
+def _load_discovery_manifest(manifest_path: Path) -> Optional[List[Tuple[Path, str]]]:
+    """
+    Cached discover_files result, or None if missing or stale.
+
+    Adding, removing or renaming a file changes its directory's mtime, so
+    the result is reused only while every walked directory keeps the
+    mtime recorded when it was listed.
+    """
+    try:
+        with open(manifest_path, "rb") as f:
+            dir_stamps, files = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable discovery manifest {manifest_path}: {e}")
+        return None
+
+    for dir_path, mtime_ns in dir_stamps:
+        try:
+            if os.stat(dir_path).st_mtime_ns != mtime_ns:
+                return None
+        except OSError:
+            return None
+    return files
+
+
+def _save_discovery_manifest(
+    manifest_path: Path,
+    dir_stamps: List[Tuple[str, int]],
+    files: List[Tuple[Path, str]],
+) -> None:
+    """Write a discovery manifest atomically; failures are logged and ignored."""
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((dir_stamps, files), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, manifest_path)
+    except OSError as e:
+        logger.warning(f"Failed to write discovery manifest {manifest_path}: {e}")
+
+
+def _iter_files(
+    root: str,
+    recursive: bool,
+    dir_stamps: Optional[List[Tuple[str, int]]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (path, name) of the regular files under ``root`` using os.scandir.
+
+    Entries come out in the same order as ``Path.glob("*")`` /
+    ``Path.glob("**/*")``: a directory's files first, then each
+    subdirectory in turn. File symlinks are followed, directory symlinks
+    are not descended into, and unreadable directories are skipped.
+    If ``dir_stamps`` is given, (directory, mtime_ns) is appended for every
+    subdirectory walked, from the DirEntry stat taken before it is listed;
+    the caller stamps ``root`` itself.
+
+    Only DirEntry methods are used on entries, so regular files cost no
+    stat call beyond the directory listing.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except PermissionError:
+        return
+
+    subdirs = []
+    for entry in entries:
+        try:
+            if entry.is_file():
+                yield entry.path, entry.name
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                if dir_stamps is not None:
+                    dir_stamps.append((entry.path, entry.stat(follow_symlinks=False).st_mtime_ns))
+                subdirs.append(entry.path)
+        except OSError:
+            continue
+
+    for subdir in subdirs:
+        yield from _iter_files(subdir, recursive, dir_stamps)
+
+
+def detect_format(file_path: Union[str, Path]) -> Optional[str]:
     """
     Detect file format based on extension.
 
     Args:
-        file_path: Path to file
+        file_path: Path to file, as a Path or a string
 
     Returns:
         'ab1' for .ab1 files, 'phd.1' for .phd.1 files, None for unknown
     """
-    suffix = file_path.suffix.lower()
-    name = file_path.name.lower()
+    return _classify(_file_name(file_path))[0]
+
+
+def _file_name(file_path: Union[str, Path]) -> str:
+    """Final path component; strings are split with os.path, not via Path."""
+    if isinstance(file_path, str):
+        return os.path.basename(file_path)
+    return file_path.name
+
+
+def _classify(name: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Format and sample ID of a bare filename, from one lowercased copy.
+
+    Returns (None, None) for names that are not .ab1 or .phd.1.
+    """
+    lower = name.lower()
 
-    if suffix == ".ab1":
-        return "ab1"
-    elif name.endswith(".phd.1"):
-        return "phd.1"
+    # len check: a file named just ".ab1" has no suffix, as with Path.suffix
+    if lower.endswith(".ab1") and len(lower) > 4:
+        return "ab1", name[:-4]
+    elif lower.endswith(".phd.1"):
+        return "phd.1", name[:-6]
     else:
-        return None
+        return None, None
 
 
-def get_sample_id(file_path: Path) -> str:
+def get_sample_id(file_path: Union[str, Path]) -> str:
     """
     Extract sample ID from filename (filename without extension).
 
     Args:
-        file_path: Path to file
+        file_path: Path to file, as a Path or a string
 
     Returns:
         Sample ID string
     """
-    name = file_path.name
+    sample_id = _classify(_file_name(file_path))[1]
 
-    # For .phd.1 files, remove both .phd and .1
-    if name.lower().endswith(".phd.1"):
-        return name[:-6]
-    else:
-        return file_path.stem
+    # For .phd.1 files both .phd and .1 are removed; other names use the stem
+    return sample_id if sample_id is not None else Path(file_path).stem
 
 
 def parse_sequence_file(
-    file_path: Path, file_format: str
-) -> Optional[Tuple[str, List[int]]]:
+    file_path: Path,
+    file_format: str,
+    with_raw: bool = False,
+    cache_dir: Optional[Path] = None,
+) -> Optional[Tuple]:
     """
     Parse a sequence file and extract sequence and quality scores.
 
     Args:
         file_path: Path to sequence file
         file_format: File format ('ab1' or 'phd.1')
+        with_raw: Also return the raw AB1 file contents, so trace
+            extraction can reuse them instead of reading the file again
+        cache_dir: Keep parsed (sequence, qualities) here, keyed by the
+            file's path, size and mtime. Not used for AB1 files with
+            ``with_raw``, which need the file contents anyway.
 
     Returns:
-        Tuple of (sequence_string, quality_list) or None if parsing fails
+        Tuple of (sequence_string, qualities) or None if parsing fails.
+        Phred scores are at most 93, so qualities are a uint8 array.
+        With ``with_raw`` the tuple is (sequence_string, qualities, raw)
+        where raw is the AB1 bytes, or None for PHD files.
     """
+    if cache_dir is not None and not (with_raw and file_format == "ab1"):
+        result = _cached_parse(file_path, file_format, cache_dir)
+        if with_raw and result is not None:
+            return result + (None,)
+        return result
+
     try:
         if file_format == "ab1":
-            return _parse_ab1(file_path)
+            data = Path(file_path).read_bytes()
+            result = _parse_ab1(file_path, data)
+            if with_raw and result is not None:
+                return result + (data,)
+            return result
         elif file_format == "phd.1":
-            return _parse_phd(file_path)
+            result = _parse_phd(file_path)
+            if with_raw and result is not None:
+                return result + (None,)
+            return result
         else:
             logger.warning(f"Unknown format '{file_format}' for file: {file_path}")
             return None
@@ -143,17 +316,128 @@ def parse_sequence_file(
         return None
 
 
-def _parse_ab1(file_path: Path) -> Optional[Tuple[str, List[int]]]:
+def _parsed_cache_path(cache_dir: Path, file_path: Path, file_format: str) -> Optional[Path]:
+    """
+    Cache file for the parsed contents of ``file_path``, or None if it
+    can't be stat'ed.
+
+    Keyed by the absolute path, size and mtime_ns of the input and the
+    package version, so edited or replaced files miss.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    h = hashlib.blake2b(digest_size=20)
+    h.update(repr((os.path.abspath(file_path), file_format, st.st_size, st.st_mtime_ns)).encode())
+    h.update(__version__.encode())
+    key = h.hexdigest()
+    return Path(cache_dir) / "parsed" / key[:2] / f"{key}.pkl"
+
+
+def _cached_parse(file_path: Path, file_format: str, cache_dir: Path) -> Optional[Tuple]:
+    """
+    parse_sequence_file with an on-disk cache of successful parses.
+
+    Unreadable entries are treated as misses; cache write failures are
+    logged and ignored.
+    """
+    cache_path = _parsed_cache_path(cache_dir, file_path, file_format)
+    if cache_path is None:
+        return parse_sequence_file(file_path, file_format)
+
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug("Ignoring unreadable parse cache entry %s: %s", cache_path, e)
+
+    result = parse_sequence_file(file_path, file_format)
+    if result is None:
+        return None
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning("Failed to write parse cache entry %s: %s", cache_path, e)
+
+    return result
+
+
+def parse_sequence_files(
+    items: List[Tuple[Path, str]],
+    max_workers: int = 4,
+    depth: int = 8,
+    with_raw: bool = False,
+    cache_dir: Optional[Path] = None,
+) -> Iterator[Tuple[Path, str, Optional[Tuple]]]:
+    """
+    Parse many sequence files on a thread pool, yielding results in order.
+
+    At most ``depth`` files are in flight at once, so a consumer that works
+    on each result overlaps its compute with the reading of the next files
+    without the whole input being parsed into memory up front.
+
+    Args:
+        items: List of (file_path, file_format) tuples
+        max_workers: Number of parsing threads
+        depth: Maximum number of files parsed ahead of the consumer
+        with_raw: Passed on to parse_sequence_file
+        cache_dir: Passed on to parse_sequence_file
+
+    Yields:
+        (file_path, file_format, parsed) where parsed is the return value of
+        parse_sequence_file (None if the file could not be parsed)
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        it = iter(items)
+
+        for file_path, file_format in it:
+            pending.append((file_path, file_format,
+                            executor.submit(parse_sequence_file, file_path, file_format, with_raw, cache_dir)))
+            if len(pending) >= depth:
+                break
+
+        while pending:
+            file_path, file_format, future = pending.popleft()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append((nxt[0], nxt[1],
+                                executor.submit(parse_sequence_file, nxt[0], nxt[1], with_raw, cache_dir)))
+            yield file_path, file_format, future.result()
+
+
+def _parse_ab1(file_path: Path, data: Optional[bytes] = None) -> Optional[Tuple[str, np.ndarray]]:
     """
     Parse an AB1 file.
 
     Args:
         file_path: Path to .ab1 file
+        data: File contents, if already read
 
     Returns:
         Tuple of (sequence, qualities) or None if no quality data
     """
-    record = SeqIO.read(str(file_path), "abi")
+    # Read the whole (small) file in one call and parse from memory; the ABI
+    # parser seeks and reads once per directory entry, which would otherwise
+    # be a syscall each
+    if data is None:
+        data = Path(file_path).read_bytes()
+
+    # Fast path: take the base calls and their qualities straight from the
+    # ABIF directory; anything unusual goes through the full Biopython parser
+    basecalls = _read_abif_basecalls(data)
+    if basecalls is not None:
+        return basecalls
+
+    record = SeqIO.read(io.BytesIO(data), "abi")
     seq = str(record.seq)
 
     # Check for quality scores
@@ -161,12 +445,77 @@ def _parse_ab1(file_path: Path) -> Optional[Tuple[str, List[int]]]:
         logger.warning(f"No quality scores found in AB1 file: {file_path}")
         return None
 
-    quals = record.letter_annotations["phred_quality"]
+    quals = np.asarray(record.letter_annotations["phred_quality"], dtype=np.uint8)
 
     return (seq, quals)
 
 
-def _parse_phd(file_path: Path) -> Optional[Tuple[str, List[int]]]:
+def _abif_entries(data: bytes, wanted: Iterable[Tuple[bytes, int]]) -> Dict[Tuple[bytes, int], Tuple[int, int, int]]:
+    """
+    Look up directory entries of an ABIF file held in memory.
+
+    Args:
+        data: Raw .ab1 file contents, starting with the ABIF marker
+        wanted: (tag name, tag number) pairs to look up
+
+    Returns:
+        Mapping of the wanted keys present in the file to
+        (element type, number of elements, payload offset)
+    """
+    wanted = set(wanted)
+
+    # Root directory entry starts at byte 6; we need its element count and
+    # the offset of the directory it points to
+    num_entries, = struct.unpack_from('>i', data, 18)
+    dir_offset, = struct.unpack_from('>i', data, 26)
+
+    entries = {}
+    for k in range(num_entries):
+        entry_offset = dir_offset + k * ABIF_DIR_ENTRY_SIZE
+        name, number, elem_type, _, num_elems, data_size, data_offset, _ = (
+            struct.unpack_from('>4sihhiiii', data, entry_offset)
+        )
+        key = (name, number)
+        if key not in wanted:
+            continue
+        if data_size <= 4:
+            data_offset = entry_offset + 20
+        entries[key] = (elem_type, num_elems, data_offset)
+    return entries
+
+
+def _read_abif_basecalls(data: bytes) -> Optional[Tuple[str, np.ndarray]]:
+    """
+    Read the PBAS2 sequence and PCON2 qualities from ABIF file contents.
+
+    Returns None whenever the result could differ from SeqIO's "abi"
+    parser (not ABIF, missing or empty tags, mismatched lengths,
+    non-ASCII bytes), so the caller can fall back to it.
+    """
+    if data[:4] != b'ABIF':
+        return None
+
+    try:
+        entries = _abif_entries(data, [(b'PBAS', 2), (b'PCON', 2)])
+    except struct.error:
+        return None
+    if len(entries) != 2:
+        return None
+
+    _, n_bases, seq_offset = entries[(b'PBAS', 2)]
+    _, n_quals, qual_offset = entries[(b'PCON', 2)]
+    if n_quals == 0 or n_bases != n_quals:
+        return None
+
+    seq_bytes = data[seq_offset:seq_offset + n_bases]
+    quals = np.frombuffer(data, dtype=np.uint8, count=n_quals, offset=qual_offset)
+    if len(seq_bytes) != n_bases or not seq_bytes.isascii() or quals.max() >= 128:
+        return None
+
+    return seq_bytes.decode('ascii'), quals.copy()
+
+
+def _parse_phd(file_path: Path) -> Optional[Tuple[str, np.ndarray]]:
     """
     Parse a PHD.1 file.
 
@@ -176,14 +525,15 @@ def _parse_phd(file_path: Path) -> Optional[Tuple[str, List[int]]]:
     Returns:
         Tuple of (sequence, qualities) or None if parsing fails
     """
-    # PHD files usually contain one record, but we'll take the first
-    records = list(SeqIO.parse(str(file_path), "phd"))
+    # PHD files usually contain one record, but we'll take the first;
+    # any later records are never parsed
+    with open(file_path) as handle:
+        record = next(SeqIO.parse(handle, "phd"), None)
 
-    if not records:
+    if record is None:
         logger.warning(f"No sequences found in PHD file: {file_path}")
         return None
 
-    record = records[0]
     seq = str(record.seq)
 
     # Check for quality scores
@@ -191,7 +541,7 @@ def _parse_phd(file_path: Path) -> Optional[Tuple[str, List[int]]]:
         logger.warning(f"No quality scores found in PHD file: {file_path}")
         return None
 
-    quals = record.letter_annotations["phred_quality"]
+    quals = np.asarray(record.letter_annotations["phred_quality"], dtype=np.uint8)
 
     return (seq, quals)
 
@@ -0,0 +1,540 @@
+"""Shared per-file processing pipeline behind the qc, trim and all commands."""
+
+import hashlib
+import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+from tqdm import tqdm
+
+from .io_utils import get_sample_id, parse_sequence_file, parse_sequence_files, make_read_id
+from .trim import apply_trim
+from .qc import compute_qc_metrics, compute_qc_metrics_failed, SummaryAccumulator
+from .writers import open_qc_metrics, open_trimmed_fastq, open_trimmed_fasta
+from . import __version__
+
+if TYPE_CHECKING:
+    from .ambiguous_calling import AmbiguousBaseCaller, CallerConfig
+
+logger = logging.getLogger(__name__)
+
+# Files parsed ahead of the one being processed in the serial path
+PREFETCH_DEPTH = 8
+PREFETCH_THREADS = 4
+
+# Progress bar refresh: at most every PROGRESS_MINITERS files and
+# PROGRESS_MININTERVAL seconds, so fast (cached) files aren't bound by TTY writes
+PROGRESS_MINITERS = 16
+PROGRESS_MININTERVAL = 0.5
+
+# Callers rebuilt inside worker processes, keyed by their config.
+_WORKER_CALLERS: Dict["CallerConfig", "AmbiguousBaseCaller"] = {}
+
+
+class FileResult(NamedTuple):
+    """Outputs of the per-file pipeline for a single input file."""
+
+    sample_id: Optional[str]
+    metrics: Optional[Dict[str, Any]]
+    trimmed_record: Optional[Dict[str, Any]]
+    seq_plot_data: Optional[Dict[str, Any]]
+    annotations: Optional[Any]
+    base_calls: Optional[Any]
+    skipped: bool
+
+
+def _get_worker_caller(caller_cfg: "CallerConfig") -> "AmbiguousBaseCaller":
+    """Return a caller for ``caller_cfg``, built once per process."""
+    caller = _WORKER_CALLERS.get(caller_cfg)
+    if caller is None:
+        # Imported here so runs without ambiguous calling never load it
+        from .ambiguous_calling import create_ambiguous_caller
+
+        caller = create_ambiguous_caller(**caller_cfg._asdict())
+        _WORKER_CALLERS[caller_cfg] = caller
+    return caller
+
+
+def _call_bases_cache_path(
+    cache_dir: Path,
+    file_path: Path,
+    caller_cfg: "CallerConfig",
+    abi_data: Optional[bytes] = None,
+) -> Path:
+    """
+    Cache file for call_bases on ``file_path`` under ``caller_cfg``.
+
+    Keyed by a BLAKE2b hash of the file contents, the caller config and the
+    package version, so edited inputs, changed thresholds or a new release
+    never hit a stale entry.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(abi_data if abi_data is not None else Path(file_path).read_bytes())
+    h.update(repr(caller_cfg).encode())
+    h.update(__version__.encode())
+    key = h.hexdigest()
+    return Path(cache_dir) / key[:2] / f"{key}.pkl"
+
+
+def _cached_call_bases(
+    caller: "AmbiguousBaseCaller",
+    file_path: Path,
+    seq: str,
+    quals: List[int],
+    caller_cfg: "CallerConfig",
+    cache_dir: Optional[Path],
+    abi_data: Optional[bytes] = None,
+):
+    """
+    caller.call_bases with an optional on-disk cache of its result.
+
+    On a hit the trace file is not read at all. Unreadable entries are
+    treated as misses; cache write failures are logged and ignored.
+    ``abi_data`` is the already-read AB1 contents, if available.
+    """
+    if cache_dir is None:
+        return caller.call_bases(file_path, seq, quals, abi_data=abi_data)
+
+    cache_path = _call_bases_cache_path(cache_dir, file_path, caller_cfg, abi_data)
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable base call cache entry {cache_path}: {e}")
+
+    base_calls = caller.call_bases(file_path, seq, quals, abi_data=abi_data)
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(base_calls, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Failed to write base call cache entry {cache_path}: {e}")
+
+    return base_calls
+
+
+def _process_one(
+    file_path: Path,
+    file_format: str,
+    caller_cfg: Optional["CallerConfig"],
+    method: str,
+    qthreshold: int,
+    min_length: int,
+    want_plots: bool = False,
+    want_metrics: bool = True,
+    want_trimmed: bool = True,
+    cache_dir: Optional[Path] = None,
+    skip_failed_metrics: bool = False,
+) -> FileResult:
+    """
+    Run parse -> ambiguous calling -> trim -> QC metrics for one file.
+
+    Module-level so it can be pickled into worker processes. The caller is
+    passed as a CallerConfig and rebuilt lazily inside the worker.
+
+    Args:
+        file_path: Path to the input file
+        file_format: Detected file format
+        caller_cfg: CallerConfig for the ambiguous caller, or None to
+            disable ambiguous calling
+        method: Trimming method (mott or ends)
+        qthreshold: Quality threshold for trimming
+        min_length: Minimum acceptable trimmed length
+        want_plots: Return per-read plot data (and base calls)
+        want_metrics: Compute per-read QC metrics
+        want_trimmed: Return the trimmed record
+        cache_dir: Directory for cached parses and call_bases results
+            (None = no cache)
+        skip_failed_metrics: Use compute_qc_metrics_failed for reads whose
+            trimmed length is below min_length
+
+    Returns:
+        FileResult for the file; ``skipped`` is True if it could not be parsed
+    """
+    result = parse_sequence_file(
+        file_path, file_format, with_raw=caller_cfg is not None, cache_dir=cache_dir
+    )
+    return _process_parsed(
+        file_path, file_format, result, caller_cfg, method, qthreshold,
+        min_length, want_plots, want_metrics, want_trimmed, cache_dir,
+        skip_failed_metrics,
+    )
+
+
+def _process_parsed(
+    file_path: Path,
+    file_format: str,
+    result: Optional[Tuple[str, List[int]]],
+    caller_cfg: Optional["CallerConfig"],
+    method: str,
+    qthreshold: int,
+    min_length: int,
+    want_plots: bool = False,
+    want_metrics: bool = True,
+    want_trimmed: bool = True,
+    cache_dir: Optional[Path] = None,
+    skip_failed_metrics: bool = False,
+) -> FileResult:
+    """
+    Run the post-parse stages of _process_one on an already parsed file.
+
+    ``result`` is the return value of parse_sequence_file (None if the file
+    could not be parsed), optionally with the raw AB1 bytes as a third
+    element; the other arguments are as for _process_one.
+    """
+    if result is None:
+        return FileResult(None, None, None, None, None, None, True)
+
+    seq, quals = result[0], result[1]
+    abi_data = result[2] if len(result) > 2 else None
+    sample_id = get_sample_id(file_path)
+
+    # Perform ambiguous base calling if enabled (only for AB1 files)
+    recalled_seq = seq
+    annotations = None
+    base_calls = None
+    if caller_cfg is not None and file_format == "ab1":
+        caller = _get_worker_caller(caller_cfg)
+        try:
+            base_calls = _cached_call_bases(
+                caller, file_path, seq, quals, caller_cfg, cache_dir, abi_data
+            )
+            recalled_seq = caller.base_calls_to_sequence(base_calls)
+            annotations = caller.annotations_table(base_calls)
+            logger.debug(f"Ambiguous calling completed for {sample_id}: {len(base_calls)} bases")
+        except Exception as e:
+            logger.warning(f"Ambiguous calling failed for {sample_id}: {e}")
+            # Fall back to original sequence
+            recalled_seq = seq
+            base_calls = None
+
+    # Apply trimming (use recalled sequence if available)
+    trimmed_seq, trimmed_quals, trim_start, trim_end = apply_trim(
+        recalled_seq, quals, method, qthreshold
+    )
+
+    metrics = None
+    if want_metrics:
+        failed = trim_end - trim_start < min_length
+        metrics_fn = compute_qc_metrics_failed if skip_failed_metrics and failed else compute_qc_metrics
+        metrics = metrics_fn(
+            sample_id=sample_id,
+            source_file=str(file_path),
+            file_format=file_format,
+            seq=recalled_seq,
+            quals=quals,
+            trim_start=trim_start,
+            trim_end=trim_end,
+            qthreshold=qthreshold,
+            min_length=min_length,
+        )
+
+    trimmed_record = None
+    if want_trimmed:
+        trimmed_record = {
+            "read_id": make_read_id(sample_id, trim_start, trim_end),
+            "seq": trimmed_seq,
+            "quals": trimmed_quals,
+        }
+
+    seq_plot_data = None
+    if want_plots:
+        seq_plot_data = {
+            'sample_id': sample_id,
+            'quals': quals,
+            'trim_start': trim_start,
+            'trim_end': trim_end,
+            'qthreshold': qthreshold,
+        }
+    else:
+        base_calls = None
+
+    return FileResult(
+        sample_id, metrics, trimmed_record, seq_plot_data, annotations, base_calls, False
+    )
+
+
+def _progress(iterable, total: int, desc: str):
+    """tqdm wrapper with rate-limited refreshes."""
+    return tqdm(
+        iterable,
+        total=total,
+        desc=desc,
+        mininterval=PROGRESS_MININTERVAL,
+        miniters=PROGRESS_MINITERS,
+    )
+
+
+def _iter_processed(
+    files: List[Tuple[Path, str]],
+    jobs: Optional[int],
+    desc: str,
+    **kwargs: Any,
+) -> Iterator[FileResult]:
+    """
+    Yield a FileResult per input file, in input order.
+
+    Files are independent, so with ``jobs > 1`` they are fanned out over a
+    process pool; otherwise they are processed in this process, with
+    parsing prefetched on a few threads.
+
+    Args:
+        files: (file_path, file_format) pairs from discover_files
+        jobs: Number of worker processes (None = os.cpu_count())
+        desc: Progress bar label
+        **kwargs: Forwarded to _process_one
+    """
+    nproc = jobs or os.cpu_count() or 1
+
+    if nproc <= 1 or len(files) <= 1:
+        for file_path, file_format, parsed in _progress(
+            parse_sequence_files(
+                files,
+                max_workers=PREFETCH_THREADS,
+                depth=PREFETCH_DEPTH,
+                with_raw=kwargs.get("caller_cfg") is not None,
+                cache_dir=kwargs.get("cache_dir"),
+            ),
+            len(files),
+            desc,
+        ):
+            yield _process_parsed(file_path, file_format, parsed, **kwargs)
+        return
+
+    worker = partial(_process_one, **kwargs)
+    paths = [file_path for file_path, _ in files]
+    formats = [file_format for _, file_format in files]
+
+    chunksize = max(1, len(files) // (4 * nproc))
+    with ProcessPoolExecutor(max_workers=min(nproc, len(files))) as executor:
+        yield from _progress(
+            executor.map(worker, paths, formats, chunksize=chunksize),
+            len(files),
+            desc,
+        )
+
+
+@dataclass
+class PlotBatch:
+    """
+    Columnar per-read data for plotting.
+
+    Scalar fields are NumPy columns preallocated for the whole run and
+    filled by index; qualities are kept as one int16 array per read. The
+    plotting functions read these columns directly via column() and rows().
+    """
+
+    sample_ids: List[str]
+    trim_starts: np.ndarray
+    trim_ends: np.ndarray
+    qthresholds: np.ndarray
+    quals_list: List[np.ndarray]
+    # QC metric columns used by the summary plots (qc/all only)
+    raw_lengths: np.ndarray
+    trimmed_lengths: np.ndarray
+    mean_qs: np.ndarray
+    pct_q20s: np.ndarray
+    gc_percents: np.ndarray
+    expected_errors: np.ndarray
+    n: int = 0
+
+    # Metric key -> column attribute
+    _METRIC_COLUMNS = {
+        "sample_id": "sample_ids",
+        "raw_length": "raw_lengths",
+        "trimmed_length": "trimmed_lengths",
+        "mean_q": "mean_qs",
+        "pct_q20": "pct_q20s",
+        "gc_percent": "gc_percents",
+        "expected_errors": "expected_errors",
+    }
+
+    @classmethod
+    def allocate(cls, capacity: int) -> "PlotBatch":
+        """Create an empty batch with room for ``capacity`` reads."""
+        return cls(
+            sample_ids=[""] * capacity,
+            trim_starts=np.zeros(capacity, dtype=np.int32),
+            trim_ends=np.zeros(capacity, dtype=np.int32),
+            qthresholds=np.zeros(capacity, dtype=np.int16),
+            quals_list=[None] * capacity,
+            raw_lengths=np.zeros(capacity, dtype=np.int32),
+            trimmed_lengths=np.zeros(capacity, dtype=np.int32),
+            mean_qs=np.zeros(capacity, dtype=np.float64),
+            pct_q20s=np.zeros(capacity, dtype=np.float64),
+            gc_percents=np.zeros(capacity, dtype=np.float64),
+            expected_errors=np.zeros(capacity, dtype=np.float64),
+        )
+
+    def add(self, seq_plot_data: Dict[str, Any], metrics: Optional[Dict[str, Any]]) -> None:
+        """Store one read at the next free index."""
+        i = self.n
+        self.sample_ids[i] = seq_plot_data['sample_id']
+        self.trim_starts[i] = seq_plot_data['trim_start']
+        self.trim_ends[i] = seq_plot_data['trim_end']
+        self.qthresholds[i] = seq_plot_data['qthreshold']
+        self.quals_list[i] = np.asarray(seq_plot_data['quals'], dtype=np.int16)
+        if metrics is not None:
+            self.raw_lengths[i] = metrics['raw_length']
+            self.trimmed_lengths[i] = metrics['trimmed_length']
+            self.mean_qs[i] = metrics['mean_q']
+            self.pct_q20s[i] = metrics['pct_q20']
+            self.gc_percents[i] = metrics['gc_percent']
+            self.expected_errors[i] = metrics['expected_errors']
+        self.n = i + 1
+
+    def __len__(self) -> int:
+        return self.n
+
+    def column(self, name: str):
+        """Return the filled part of a column, by per-read metric key."""
+        return getattr(self, self._METRIC_COLUMNS[name])[:self.n]
+
+    def rows(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per-read plot dicts (sample_id, quals, trim bounds, threshold)."""
+        stop = self.n if limit is None else min(limit, self.n)
+        return [
+            {
+                'sample_id': self.sample_ids[i],
+                'quals': self.quals_list[i],
+                'trim_start': int(self.trim_starts[i]),
+                'trim_end': int(self.trim_ends[i]),
+                'qthreshold': int(self.qthresholds[i]),
+            }
+            for i in range(stop)
+        ]
+
+
+@dataclass
+class PipelineResult:
+    """
+    Aggregated outputs of run_pipeline.
+
+    Per-read metrics and trimmed reads have already been streamed to disk;
+    only what the callers still need afterwards is kept here.
+    """
+
+    summary: Optional[Dict[str, Any]] = None
+    n_reads: int = 0
+    skipped_count: int = 0
+    base_call_annotations: Dict[str, Any] = field(default_factory=dict)
+    plot_batch: Optional[PlotBatch] = None  # Only with do_plots
+    base_calls_for_plots: Dict[str, Any] = field(default_factory=dict)  # Only with do_plots
+
+
+def run_pipeline(
+    files: List[Tuple[Path, str]],
+    *,
+    output_dir: Path,
+    do_qc: bool,
+    do_trim: bool,
+    do_plots: bool,
+    caller_cfg: Optional["CallerConfig"],
+    method: str,
+    qthreshold: int,
+    min_length: int,
+    jobs: Optional[int] = None,
+    fastq_path: Optional[Path] = None,
+    fasta_path: Optional[Path] = None,
+    desc: str = "Processing files",
+    cache_dir: Optional[Path] = None,
+    skip_failed_metrics: bool = False,
+) -> PipelineResult:
+    """
+    Run the per-file pipeline over ``files`` once and stream its outputs.
+
+    With ``do_qc`` per-read metrics go to ``output_dir/qc`` and a summary is
+    accumulated; with ``do_trim`` trimmed reads go to ``fastq_path`` (and
+    ``fasta_path`` if given).
+
+    Args:
+        files: (file_path, file_format) pairs from discover_files
+        output_dir: Output directory
+        do_qc: Compute and write per-read QC metrics
+        do_trim: Write trimmed reads
+        do_plots: Keep per-read data needed for plotting
+        caller_cfg: CallerConfig for the ambiguous caller, or None
+        method: Trimming method (mott or ends)
+        qthreshold: Quality threshold for trimming
+        min_length: Minimum acceptable trimmed length
+        jobs: Number of worker processes (None = os.cpu_count())
+        fastq_path: Trimmed FASTQ output path (defaults to trim/trimmed.fastq.gz)
+        fasta_path: Optional trimmed FASTA output path
+        desc: Progress bar label
+        cache_dir: Directory for cached parses and ambiguous calling results
+            (None = no cache)
+        skip_failed_metrics: Leave quality metrics of reads failing
+            min_length as NaN instead of computing them
+
+    Returns:
+        PipelineResult
+    """
+    if do_trim and fastq_path is None:
+        fastq_path = output_dir / "trim" / "trimmed.fastq.gz"
+
+    out = PipelineResult()
+    if do_plots:
+        out.plot_batch = PlotBatch.allocate(len(files))
+    summary_acc = SummaryAccumulator()
+
+    results = _iter_processed(
+        files,
+        jobs,
+        desc,
+        caller_cfg=caller_cfg,
+        method=method,
+        qthreshold=qthreshold,
+        min_length=min_length,
+        want_plots=do_plots,
+        want_metrics=do_qc,
+        want_trimmed=do_trim,
+        cache_dir=cache_dir,
+        skip_failed_metrics=skip_failed_metrics,
+    )
+    with ExitStack() as stack:
+        metrics_writer = None
+        fastq_writer = None
+        fasta_writer = None
+        if do_qc:
+            metrics_writer = stack.enter_context(open_qc_metrics(output_dir))
+        if do_trim:
+            fastq_writer = stack.enter_context(open_trimmed_fastq(fastq_path))
+            if fasta_path is not None:
+                fasta_writer = stack.enter_context(open_trimmed_fasta(fasta_path))
+
+        for res in results:
+            if res.skipped:
+                out.skipped_count += 1
+                continue
+
+            out.n_reads += 1
+            if metrics_writer is not None:
+                metrics_writer.write(res.metrics)
+                summary_acc.add(res.metrics)
+            if fastq_writer is not None:
+                fastq_writer.write(res.trimmed_record)
+            if fasta_writer is not None:
+                fasta_writer.write(res.trimmed_record)
+            if res.annotations is not None:
+                out.base_call_annotations[res.sample_id] = res.annotations
+
+            # Store data for plotting
+            if do_plots:
+                out.plot_batch.add(res.seq_plot_data, res.metrics)
+                if res.base_calls is not None:
+                    out.base_calls_for_plots[res.sample_id] = res.base_calls
+
+    if do_qc:
+        out.summary = summary_acc.result()
+    return out
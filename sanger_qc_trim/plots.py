@@ -1,17 +1,74 @@
 """Plotting functions for visualizing sequence quality and trimming."""
 
 import logging
+import sys
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+import matplotlib
+
+# Plots are only ever written to files, so use the non-interactive backend
+# and skip GUI toolkit setup; leave an already-imported pyplot alone so an
+# interactive session keeps its backend
+if "matplotlib.pyplot" not in sys.modules:
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from .ambiguous_calling import (
+    BaseCall,
+    BaseCallArray,
+    CALL_MODES,
+    FLAG_SETS,
+    MODE_AMBIGUOUS,
+    MODE_N,
+    MODE_SINGLE,
+)
+
 logger = logging.getLogger(__name__)
 
 
+def _metric_column(metrics, name: str) -> np.ndarray:
+    """
+    One per-read metric as an array.
+
+    Accepts a list of metric dicts or a columnar batch exposing
+    ``column(name)`` (pipeline.PlotBatch), which is returned without copying.
+    """
+    if hasattr(metrics, "column"):
+        return np.asarray(metrics.column(name))
+    return np.array([m[name] for m in metrics])
+
+
+def _m4_downsample(values, width_px: int):
+    """
+    Reduce a line to at most four points per horizontal pixel (M4).
+
+    Each of ``width_px`` buckets keeps its first, minimum, maximum and last
+    point, which draws the same line at that width. Series with no more
+    than 4 points per pixel are returned unchanged.
+
+    Returns:
+        Tuple of (x positions, values)
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if width_px <= 0 or n <= 4 * width_px:
+        return np.arange(n), values
+
+    edges = np.linspace(0, n, width_px + 1).astype(np.intp)
+    keep = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = values[start:end]
+        keep.extend((start, start + int(np.argmin(bucket)),
+                     start + int(np.argmax(bucket)), end - 1))
+    keep = np.unique(keep)
+    return keep, values[keep]
+
+
 def plot_sequence_trim(
     sample_id: str,
     quals: List[int],
@@ -19,6 +76,7 @@ def plot_sequence_trim(
     trim_end: int,
     qthreshold: int,
     output_path: Path,
+    fmt: str = "png",
 ) -> None:
     """
     Plot quality scores with trimmed region highlighted.
@@ -30,13 +88,18 @@ def plot_sequence_trim(
         trim_end: Trim end position
         qthreshold: Quality threshold used
         output_path: Path to save plot
+        fmt: "png" (150 DPI raster) or "svg"; SVG skips rasterization and
+            is written with an .svg suffix
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
+    if fmt not in ("png", "svg"):
+        raise ValueError(f"Unknown plot format: {fmt}")
 
-    positions = np.arange(len(quals))
+    quals = np.asarray(quals)
+    fig, ax = plt.subplots(figsize=(12, 6))
 
-    # Plot quality scores
-    ax.plot(positions, quals, 'k-', linewidth=1, alpha=0.7, label='Quality scores')
+    # Plot quality scores, reduced to what the 150 DPI canvas can show
+    positions, line_quals = _m4_downsample(quals, int(fig.get_figwidth() * 150))
+    ax.plot(positions, line_quals, 'k-', linewidth=1, alpha=0.7, label='Quality scores')
 
     # Highlight trimmed region (kept)
     if trim_end > trim_start:
@@ -64,7 +127,7 @@ def plot_sequence_trim(
     # Add text annotations
     raw_length = len(quals)
     trimmed_length = trim_end - trim_start
-    mean_q = np.mean(quals) if quals else 0
+    mean_q = quals.mean() if len(quals) else 0
 
     textstr = f'Raw length: {raw_length} bp\n'
     textstr += f'Trimmed length: {trimmed_length} bp ({100*trimmed_length/raw_length:.1f}%)\n'
@@ -78,12 +141,16 @@ def plot_sequence_trim(
     ax.grid(True, alpha=0.3)
 
     # Set y-axis limits
-    ax.set_ylim(0, max(50, max(quals) + 5) if quals else 50)
+    ax.set_ylim(0, max(50, int(quals.max()) + 5) if len(quals) else 50)
 
     plt.tight_layout()
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    if fmt == "svg":
+        output_path = output_path.with_suffix(".svg")
+        fig.savefig(output_path, bbox_inches='tight')
+    else:
+        fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
 
     logger.debug(f"Saved quality plot: {output_path}")
 
@@ -128,15 +195,14 @@ def plot_multiple_sequences(
         ax = axes[row, col]
 
         sample_id = seq_data['sample_id']
-        quals = seq_data['quals']
+        quals = np.asarray(seq_data['quals'])
         trim_start = seq_data['trim_start']
         trim_end = seq_data['trim_end']
         qthreshold = seq_data['qthreshold']
 
-        positions = np.arange(len(quals))
-
-        # Plot quality scores
-        ax.plot(positions, quals, 'k-', linewidth=0.8, alpha=0.7)
+        # Plot quality scores (full figure width is an upper bound per panel)
+        positions, line_quals = _m4_downsample(quals, int(fig.get_figwidth() * 150))
+        ax.plot(positions, line_quals, 'k-', linewidth=0.8, alpha=0.7)
 
         # Highlight regions
         if trim_end > trim_start:
@@ -171,37 +237,40 @@ def plot_multiple_sequences(
 
     plt.tight_layout(rect=[0, 0, 1, 0.97])
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
 
     logger.info(f"Saved multi-sequence plot: {output_path}")
 
 
 def plot_summary_histograms(
-    metrics_list: List[Dict[str, Any]],
+    metrics_list: Union[List[Dict[str, Any]], Any],
     output_path: Path,
 ) -> None:
     """
     Plot summary histograms of key metrics.
 
     Args:
-        metrics_list: List of per-read metrics
+        metrics_list: Per-read metrics (list of dicts or a PlotBatch)
         output_path: Path to save plot
     """
-    if not metrics_list:
+    if len(metrics_list) == 0:
         logger.warning("No metrics to plot")
         return
 
     fig, axes = plt.subplots(2, 3, figsize=(15, 10))
     axes = axes.flatten()
 
-    # Extract data
-    raw_lengths = [m['raw_length'] for m in metrics_list]
-    trimmed_lengths = [m['trimmed_length'] for m in metrics_list]
-    mean_qs = [m['mean_q'] for m in metrics_list]
-    pct_q20s = [m['pct_q20'] * 100 for m in metrics_list]
-    gc_percents = [m['gc_percent'] for m in metrics_list]
-    expected_errors = [m['expected_errors'] for m in metrics_list]
+    # Extract data; quality metrics may be NaN for reads that skipped them
+    def finite(values):
+        return values[np.isfinite(values)]
+
+    raw_lengths = _metric_column(metrics_list, 'raw_length')
+    trimmed_lengths = _metric_column(metrics_list, 'trimmed_length')
+    mean_qs = finite(_metric_column(metrics_list, 'mean_q'))
+    pct_q20s = finite(_metric_column(metrics_list, 'pct_q20') * 100)
+    gc_percents = finite(_metric_column(metrics_list, 'gc_percent'))
+    expected_errors = finite(_metric_column(metrics_list, 'expected_errors'))
 
     # Plot 1: Raw length distribution
     axes[0].hist(raw_lengths, bins=20, color='steelblue', alpha=0.7, edgecolor='black')
@@ -253,32 +322,32 @@ def plot_summary_histograms(
     plt.tight_layout()
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
 
     logger.info(f"Saved summary histograms: {output_path}")
 
 
 def plot_length_comparison(
-    metrics_list: List[Dict[str, Any]],
+    metrics_list: Union[List[Dict[str, Any]], Any],
     output_path: Path,
 ) -> None:
     """
     Plot before/after length comparison.
 
     Args:
-        metrics_list: List of per-read metrics
+        metrics_list: Per-read metrics (list of dicts or a PlotBatch)
         output_path: Path to save plot
     """
-    if not metrics_list:
+    if len(metrics_list) == 0:
         logger.warning("No metrics to plot")
         return
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
-    sample_ids = [m['sample_id'] for m in metrics_list]
-    raw_lengths = [m['raw_length'] for m in metrics_list]
-    trimmed_lengths = [m['trimmed_length'] for m in metrics_list]
+    sample_ids = list(_metric_column(metrics_list, 'sample_id'))
+    raw_lengths = _metric_column(metrics_list, 'raw_length')
+    trimmed_lengths = _metric_column(metrics_list, 'trimmed_length')
 
     x = np.arange(len(sample_ids))
     width = 0.35
@@ -302,7 +371,7 @@ def plot_length_comparison(
                 color='purple', edgecolor='black', linewidth=0.5)
 
     # Add diagonal line
-    max_len = max(max(raw_lengths), max(trimmed_lengths))
+    max_len = max(raw_lengths.max(), trimmed_lengths.max())
     ax2.plot([0, max_len], [0, max_len], 'r--', linewidth=2, alpha=0.5, label='No trimming')
 
     ax2.set_xlabel('Raw Length (bp)')
@@ -312,7 +381,8 @@ def plot_length_comparison(
     ax2.grid(True, alpha=0.3)
 
     # Add statistics text
-    retention = 100 * sum(trimmed_lengths) / sum(raw_lengths) if sum(raw_lengths) > 0 else 0
+    total_raw = raw_lengths.sum()
+    retention = 100 * trimmed_lengths.sum() / total_raw if total_raw > 0 else 0
     textstr = f'Overall retention: {retention:.1f}%\n'
     textstr += f'Mean raw: {np.mean(raw_lengths):.1f} bp\n'
     textstr += f'Mean trimmed: {np.mean(trimmed_lengths):.1f} bp'
@@ -322,8 +392,8 @@ def plot_length_comparison(
 
     plt.tight_layout()
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
 
     logger.info(f"Saved length comparison plot: {output_path}")
 
@@ -347,13 +417,14 @@ def plot_sequence_trim_interactive(
         qthreshold: Quality threshold used
         output_path: Path to save HTML file
     """
-    positions = list(range(len(quals)))
+    quals = np.asarray(quals)
+    positions = np.arange(len(quals))
 
     # Create figure
     fig = go.Figure()
 
-    # Add quality score line
-    fig.add_trace(go.Scatter(
+    # Add quality score line (WebGL: stays responsive for long traces)
+    fig.add_trace(go.Scattergl(
         x=positions,
         y=quals,
         mode='lines',
@@ -406,7 +477,7 @@ def plot_sequence_trim_interactive(
     # Calculate statistics
     raw_length = len(quals)
     trimmed_length = trim_end - trim_start
-    mean_q = np.mean(quals) if quals else 0
+    mean_q = quals.mean() if len(quals) else 0
 
     # Update layout
     fig.update_layout(
@@ -440,7 +511,7 @@ def plot_sequence_trim_interactive(
     )
 
     # Set y-axis range
-    fig.update_yaxes(range=[0, max(50, max(quals) + 5) if quals else 50])
+    fig.update_yaxes(range=[0, max(50, int(quals.max()) + 5) if len(quals) else 50])
 
     # Save to HTML
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -449,10 +520,24 @@ def plot_sequence_trim_interactive(
     logger.debug(f"Saved interactive quality plot: {output_path}")
 
 
+def _ascii_column(codes: np.ndarray) -> np.ndarray:
+    """One-character str per ASCII code, as an object array."""
+    return np.array(list(codes.tobytes().decode('ascii')), dtype=object)
+
+
+def _customdata(columns: List[np.ndarray], index) -> np.ndarray:
+    """Plotly customdata rows (one per point) from per-position columns."""
+    rows = [column[index] for column in columns]
+    out = np.empty((len(rows[0]), len(rows)), dtype=object)
+    for j, values in enumerate(rows):
+        out[:, j] = values
+    return out
+
+
 def plot_ambiguous_calling_interactive(
     sample_id: str,
     quals: List[int],
-    base_calls: List[Any],  # List of BaseCall objects
+    base_calls: Union[BaseCallArray, List[BaseCall]],
     trim_start: int,
     trim_end: int,
     qthreshold: int,
@@ -464,28 +549,34 @@ def plot_ambiguous_calling_interactive(
     Args:
         sample_id: Sample identifier
         quals: List of quality scores
-        base_calls: List of BaseCall objects from ambiguous calling
+        base_calls: BaseCallArray (or list of BaseCall objects) from ambiguous calling
         trim_start: Trim start position
         trim_end: Trim end position
         qthreshold: Quality threshold used
         output_path: Path to save HTML file
     """
-    positions = list(range(len(quals)))
-
-    # Extract information from base calls
-    called_bases = [bc.called_base for bc in base_calls]
-    call_modes = [bc.call_mode for bc in base_calls]
-    sprs = [bc.spr for bc in base_calls]
-    snrs = [bc.snr for bc in base_calls]
-    allele_fracs = [bc.allele_fraction for bc in base_calls]
-    primary_bases = [bc.primary_base for bc in base_calls]
-    secondary_bases = [bc.secondary_base for bc in base_calls]
-    flags_list = [', '.join(bc.flags) if bc.flags else '' for bc in base_calls]
+    quals = np.asarray(quals)
+    positions = np.arange(len(quals))
+
+    # Read the call columns directly rather than walking BaseCall views
+    if not isinstance(base_calls, BaseCallArray):
+        base_calls = BaseCallArray.from_base_calls(base_calls)
+
+    # Hover columns as object arrays of Python str/float, indexable by position
+    called_bases = _ascii_column(base_calls.called_base)
+    call_modes = np.array(CALL_MODES, dtype=object)[base_calls.call_mode]
+    sprs = base_calls.spr.astype(object)
+    snrs = base_calls.snr.astype(object)
+    allele_fracs = base_calls.allele_fraction.astype(object)
+    primary_bases = _ascii_column(base_calls.primary_base)
+    secondary_bases = _ascii_column(base_calls.secondary_base)
+    flag_strings = np.array([', '.join(flags) for flags in FLAG_SETS], dtype=object)
+    flags_list = flag_strings[base_calls.flag_code]
 
     # Identify different call types
-    ambiguous_positions = [i for i, bc in enumerate(base_calls) if bc.call_mode == 'ambiguous']
-    n_positions = [i for i, bc in enumerate(base_calls) if bc.call_mode == 'N']
-    single_positions = [i for i, bc in enumerate(base_calls) if bc.call_mode == 'single']
+    ambiguous_positions = np.flatnonzero(base_calls.call_mode == MODE_AMBIGUOUS).tolist()
+    n_positions = np.flatnonzero(base_calls.call_mode == MODE_N).tolist()
+    single_positions = np.flatnonzero(base_calls.call_mode == MODE_SINGLE).tolist()
 
     # Create figure with subplots
     fig = make_subplots(
@@ -496,7 +587,7 @@ def plot_ambiguous_calling_interactive(
     )
 
     # Top plot: Quality scores
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=positions,
         y=quals,
         mode='lines',
@@ -508,9 +599,9 @@ def plot_ambiguous_calling_interactive(
 
     # Mark ambiguous positions on quality plot
     if ambiguous_positions:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=ambiguous_positions,
-            y=[quals[i] for i in ambiguous_positions],
+            y=quals[ambiguous_positions],
             mode='markers',
             name='Ambiguous (IUPAC)',
             marker=dict(
@@ -529,17 +620,18 @@ def plot_ambiguous_calling_interactive(
                           'Primary: %{customdata[4]}<br>' +
                           'Secondary: %{customdata[5]}<br>' +
                           'Flags: %{customdata[6]}<extra></extra>',
-            customdata=[[called_bases[i], sprs[i], snrs[i], allele_fracs[i],
-                        primary_bases[i], secondary_bases[i], flags_list[i]]
-                       for i in ambiguous_positions],
+            customdata=_customdata(
+                [called_bases, sprs, snrs, allele_fracs, primary_bases, secondary_bases, flags_list],
+                ambiguous_positions,
+            ),
             showlegend=True
         ), row=1, col=1)
 
     # Mark N positions on quality plot
     if n_positions:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=n_positions,
-            y=[quals[i] for i in n_positions],
+            y=quals[n_positions],
             mode='markers',
             name='No call (N)',
             marker=dict(
@@ -554,7 +646,7 @@ def plot_ambiguous_calling_interactive(
                           'SPR: %{customdata[0]:.3f}<br>' +
                           'SNR: %{customdata[1]:.2f}<br>' +
                           'Flags: %{customdata[2]}<extra></extra>',
-            customdata=[[sprs[i], snrs[i], flags_list[i]] for i in n_positions],
+            customdata=_customdata([sprs, snrs, flags_list], n_positions),
             showlegend=True
         ), row=1, col=1)
 
@@ -599,19 +691,9 @@ def plot_ambiguous_calling_interactive(
     fig.add_hline(y=30, line_dash="dot", line_color="gray", opacity=0.5, row=1, col=1)
 
     # Bottom plot: Base call type indicator
-    # Create a categorical plot showing call types
-    call_type_numeric = []
-    call_type_colors = []
-    for mode in call_modes:
-        if mode == 'single':
-            call_type_numeric.append(1)
-            call_type_colors.append('green')
-        elif mode == 'ambiguous':
-            call_type_numeric.append(2)
-            call_type_colors.append('orange')
-        else:  # 'N'
-            call_type_numeric.append(0)
-            call_type_colors.append('red')
+    # Bar heights N=0, single=1, ambiguous=2 are the CALL_MODES codes themselves
+    call_type_numeric = base_calls.call_mode
+    call_type_colors = np.array(['red', 'green', 'orange'], dtype=object)[base_calls.call_mode]
 
     fig.add_trace(go.Bar(
         x=positions,
@@ -625,14 +707,14 @@ def plot_ambiguous_calling_interactive(
                       'Base: %{customdata[0]}<br>' +
                       'Mode: %{customdata[1]}<br>' +
                       'SPR: %{customdata[2]:.3f}<extra></extra>',
-        customdata=[[called_bases[i], call_modes[i], sprs[i]] for i in positions],
+        customdata=_customdata([called_bases, call_modes, sprs], slice(len(quals))),
         showlegend=False
     ), row=2, col=1)
 
     # Calculate statistics
     raw_length = len(quals)
     trimmed_length = trim_end - trim_start
-    mean_q = np.mean(quals) if quals else 0
+    mean_q = quals.mean() if len(quals) else 0
     n_ambiguous = len(ambiguous_positions)
     n_no_calls = len(n_positions)
     n_single = len(single_positions)
@@ -668,7 +750,7 @@ def plot_ambiguous_calling_interactive(
     )
 
     # Set y-axis range for quality plot
-    fig.update_yaxes(range=[0, max(50, max(quals) + 5) if quals else 50], row=1, col=1)
+    fig.update_yaxes(range=[0, max(50, int(quals.max()) + 5) if len(quals) else 50], row=1, col=1)
     fig.update_yaxes(range=[-0.5, 2.5], row=2, col=1)
 
     # Add statistics annotation
@@ -1,7 +1,15 @@
 """QC statistics computation for Sanger sequencing reads."""
 
+from array import array
+
 import numpy as np
-from typing import Dict, Any
+import pandas as pd
+from typing import Dict, Any, Iterable, List
+
+from ._jit import HAVE_NUMBA, njit
+
+# Per-base error probability 10^(-Q/10) for every 8-bit Phred score
+_EE_LUT = 10.0 ** (-np.arange(256) / 10.0)
 
 
 def compute_qc_metrics(
@@ -32,17 +40,21 @@ def compute_qc_metrics(
     Returns:
         Dictionary of QC metrics
     """
-    q_array = np.array(quals, dtype=float)
+    q_int = np.asarray(quals, dtype=np.int32)
     raw_length = len(seq)
     trimmed_length = trim_end - trim_start
 
-    # Basic quality statistics
-    mean_q = float(np.mean(q_array)) if len(q_array) > 0 else 0.0
-    median_q = float(np.median(q_array)) if len(q_array) > 0 else 0.0
-
-    # Quality thresholds
-    pct_q20 = float(np.mean(q_array >= 20)) if len(q_array) > 0 else 0.0
-    pct_q30 = float(np.mean(q_array >= 30)) if len(q_array) > 0 else 0.0
+    # Quality statistics and longest high-quality stretch
+    n = len(q_int)
+    if n > 0:
+        q_sum, expected_errors, n_q20, n_q30, hq_longest_stretch_len = _quality_stats(q_int, qthreshold)
+        mean_q = q_sum / n
+        median_q = float(np.median(q_int))
+        pct_q20 = n_q20 / n
+        pct_q30 = n_q30 / n
+    else:
+        mean_q = median_q = pct_q20 = pct_q30 = expected_errors = 0.0
+        hq_longest_stretch_len = 0
 
     # GC content (ignoring N)
     seq_upper = seq.upper()
@@ -51,12 +63,6 @@ def compute_qc_metrics(
     non_n_count = raw_length - n_count
     gc_percent = (100.0 * gc_count / non_n_count) if non_n_count > 0 else 0.0
 
-    # Expected errors
-    expected_errors = float(np.sum(10 ** (-q_array / 10))) if len(q_array) > 0 else 0.0
-
-    # Longest high-quality stretch
-    hq_longest_stretch_len = _longest_hq_stretch(quals, qthreshold)
-
     # Pass/fail
     passed_minlen = "yes" if trimmed_length >= min_length else "no"
 
@@ -80,88 +86,403 @@ def compute_qc_metrics(
     }
 
 
+def compute_qc_metrics_failed(
+    sample_id: str,
+    source_file: str,
+    file_format: str,
+    seq: str,
+    quals: list[int],
+    trim_start: int,
+    trim_end: int,
+    qthreshold: int,
+    min_length: int,
+) -> Dict[str, Any]:
+    """
+    Lightweight compute_qc_metrics for reads already known to fail min_length.
+
+    Same arguments and keys as compute_qc_metrics, but the quality and
+    composition statistics (mean/median Q, Q20/Q30, GC%, expected errors)
+    are NaN instead of computed. Counts and trim coordinates are still
+    filled in.
+
+    Returns:
+        Dictionary of QC metrics
+    """
+    trimmed_length = trim_end - trim_start
+    nan = float("nan")
+
+    return {
+        "sample_id": sample_id,
+        "source_file": source_file,
+        "format": file_format,
+        "raw_length": len(seq),
+        "mean_q": nan,
+        "median_q": nan,
+        "pct_q20": nan,
+        "pct_q30": nan,
+        "gc_percent": nan,
+        "n_count": seq.upper().count("N"),
+        "expected_errors": nan,
+        "hq_longest_stretch_len": _longest_hq_stretch(quals, qthreshold),
+        "trim_start": trim_start,
+        "trim_end": trim_end,
+        "trimmed_length": trimmed_length,
+        "passed_minlen": "yes" if trimmed_length >= min_length else "no",
+    }
+
+
+def _pad_rows(rows: List[np.ndarray], fill, dtype) -> np.ndarray:
+    """Stack ragged 1-D arrays into a 2-D array padded with ``fill``."""
+    width = max((len(r) for r in rows), default=0)
+    out = np.full((len(rows), width), fill, dtype=dtype)
+    for i, r in enumerate(rows):
+        out[i, :len(r)] = r
+    return out
+
+
+def _longest_true_run(mask: np.ndarray) -> np.ndarray:
+    """Length of the longest run of True values in each row of ``mask``."""
+    if mask.shape[1] == 0:
+        return np.zeros(mask.shape[0], dtype=np.int64)
+    run_ends = np.cumsum(mask, axis=1)
+    # Running count at the most recent False resets the run
+    resets = np.maximum.accumulate(np.where(mask, 0, run_ends), axis=1)
+    return (run_ends - resets).max(axis=1)
+
+
+def _padded_quality_stats(records: List[Dict[str, Any]]):
+    """Batch quality columns from padded 2-D NumPy reductions (no Numba)."""
+    q_rows = [np.asarray(r["quals"], dtype=np.float64) for r in records]
+    q_len = np.array([len(q) for q in q_rows], dtype=np.int64)
+    q = _pad_rows(q_rows, np.nan, np.float64)
+    valid = ~np.isnan(q)
+    has_q = q_len > 0
+    denom = np.maximum(q_len, 1)
+
+    with np.errstate(invalid="ignore"):
+        q_zero = np.where(valid, q, 0.0)
+        mean_q = np.where(has_q, q_zero.sum(axis=1) / denom, 0.0)
+        pct_q20 = np.where(has_q, (q_zero >= 20).sum(axis=1) / denom, 0.0)
+        pct_q30 = np.where(has_q, (q_zero >= 30).sum(axis=1) / denom, 0.0)
+        expected_errors = np.where(valid, 10 ** (-q_zero / 10), 0.0).sum(axis=1)
+        median_q = np.zeros(len(records))
+        if q.shape[1]:
+            median_q[has_q] = np.nanmedian(q[has_q], axis=1)
+
+    thresholds = np.array([r["qthreshold"] for r in records], dtype=np.float64)
+    hq_longest = _longest_true_run(valid & (q_zero >= thresholds[:, None]))
+    return mean_q, median_q, pct_q20, pct_q30, expected_errors, hq_longest
+
+
+@njit(cache=True)
+def _batch_quality_stats_nb(quals, offsets, thresholds, ee_lut):
+    """Compiled _quality_stats_nb over reads concatenated at ``offsets``."""
+    n_reads = offsets.shape[0] - 1
+    mean_q = np.zeros(n_reads)
+    median_q = np.zeros(n_reads)
+    pct_q20 = np.zeros(n_reads)
+    pct_q30 = np.zeros(n_reads)
+    expected_errors = np.zeros(n_reads)
+    hq_longest = np.zeros(n_reads, dtype=np.int64)
+    for r in range(n_reads):
+        q = quals[offsets[r]:offsets[r + 1]]
+        n = q.shape[0]
+        if n == 0:
+            continue
+        total, ee, n_q20, n_q30, best = _quality_stats_nb(q, thresholds[r], ee_lut)
+        mean_q[r] = total / n
+        median_q[r] = np.median(q)
+        pct_q20[r] = n_q20 / n
+        pct_q30[r] = n_q30 / n
+        expected_errors[r] = ee
+        hq_longest[r] = best
+    return mean_q, median_q, pct_q20, pct_q30, expected_errors, hq_longest
+
+
+def _batch_quality_stats(records: List[Dict[str, Any]]):
+    """Batch quality columns from one compiled pass over the concatenated reads."""
+    q_rows = [np.asarray(r["quals"], dtype=np.int32) for r in records]
+    offsets = np.zeros(len(q_rows) + 1, dtype=np.int64)
+    np.cumsum([len(q) for q in q_rows], out=offsets[1:])
+    quals = np.concatenate(q_rows) if q_rows else np.zeros(0, dtype=np.int32)
+    thresholds = np.array([r["qthreshold"] for r in records], dtype=np.int64)
+    return _batch_quality_stats_nb(quals, offsets, thresholds, _EE_LUT)
+
+
+def compute_qc_metrics_batch(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Compute compute_qc_metrics for many reads in one vectorized pass.
+
+    Quality statistics come from one compiled pass over the concatenated
+    reads when Numba is installed, and from padded 2-D NumPy reductions
+    otherwise. Sequences are stacked into a padded byte array, so no
+    statistic needs one Python call per read.
+
+    Args:
+        records: One dict per read with the keyword arguments of
+            compute_qc_metrics (sample_id, source_file, file_format, seq,
+            quals, trim_start, trim_end, qthreshold, min_length)
+
+    Returns:
+        DataFrame with one row per record and the compute_qc_metrics columns
+    """
+    columns = [
+        "sample_id", "source_file", "format", "raw_length", "mean_q", "median_q",
+        "pct_q20", "pct_q30", "gc_percent", "n_count", "expected_errors",
+        "hq_longest_stretch_len", "trim_start", "trim_end", "trimmed_length",
+        "passed_minlen",
+    ]
+    if not records:
+        return pd.DataFrame(columns=columns)
+
+    if HAVE_NUMBA:
+        mean_q, median_q, pct_q20, pct_q30, expected_errors, hq_longest = _batch_quality_stats(records)
+    else:
+        mean_q, median_q, pct_q20, pct_q30, expected_errors, hq_longest = _padded_quality_stats(records)
+
+    # GC content (ignoring N), case-insensitive
+    s_rows = [np.frombuffer(r["seq"].upper().encode("ascii"), dtype=np.uint8) for r in records]
+    raw_length = np.array([len(s) for s in s_rows], dtype=np.int64)
+    s = _pad_rows(s_rows, 0, np.uint8)
+    gc_count = ((s == ord("G")) | (s == ord("C"))).sum(axis=1)
+    n_count = (s == ord("N")).sum(axis=1)
+    non_n = raw_length - n_count
+    gc_percent = np.where(non_n > 0, 100.0 * gc_count / np.maximum(non_n, 1), 0.0)
+
+    trim_start = np.array([r["trim_start"] for r in records], dtype=np.int64)
+    trim_end = np.array([r["trim_end"] for r in records], dtype=np.int64)
+    trimmed_length = trim_end - trim_start
+    min_length = np.array([r["min_length"] for r in records], dtype=np.int64)
+
+    # Same rounding as compute_qc_metrics (Python round, per value)
+    def _round(values, ndigits):
+        return [round(float(v), ndigits) for v in values]
+
+    return pd.DataFrame({
+        "sample_id": [r["sample_id"] for r in records],
+        "source_file": [r["source_file"] for r in records],
+        "format": [r["file_format"] for r in records],
+        "raw_length": raw_length,
+        "mean_q": _round(mean_q, 2),
+        "median_q": _round(median_q, 2),
+        "pct_q20": _round(pct_q20, 4),
+        "pct_q30": _round(pct_q30, 4),
+        "gc_percent": _round(gc_percent, 2),
+        "n_count": n_count.astype(np.int64),
+        "expected_errors": _round(expected_errors, 2),
+        "hq_longest_stretch_len": hq_longest.astype(np.int64),
+        "trim_start": trim_start,
+        "trim_end": trim_end,
+        "trimmed_length": trimmed_length,
+        "passed_minlen": np.where(trimmed_length >= min_length, "yes", "no"),
+    }, columns=columns)
+
+
+@njit(cache=True)
+def _longest_run_nb(quals: np.ndarray, threshold: int) -> int:
+    """Compiled _longest_hq_stretch over an int32 quality array."""
+    best = 0
+    cur = 0
+    for i in range(quals.shape[0]):
+        if quals[i] >= threshold:
+            cur += 1
+            if cur > best:
+                best = cur
+        else:
+            cur = 0
+    return best
+
+
+@njit(cache=True)
+def _quality_stats_nb(quals: np.ndarray, threshold: int, ee_lut: np.ndarray):
+    """Compiled single pass for _quality_stats over an int32 quality array."""
+    total = 0
+    expected_errors = 0.0
+    n_q20 = 0
+    n_q30 = 0
+    best = 0
+    cur = 0
+    for i in range(quals.shape[0]):
+        v = quals[i]
+        total += v
+        if 0 <= v < ee_lut.shape[0]:
+            expected_errors += ee_lut[v]
+        else:
+            expected_errors += 10.0 ** (-v / 10.0)
+        if v >= 20:
+            n_q20 += 1
+        if v >= 30:
+            n_q30 += 1
+        if v >= threshold:
+            cur += 1
+            if cur > best:
+                best = cur
+        else:
+            cur = 0
+    return total, expected_errors, n_q20, n_q30, best
+
+
+def _quality_stats(q_int: np.ndarray, threshold: int):
+    """
+    Quality sums for compute_qc_metrics in one pass over a non-empty read.
+
+    Returns:
+        Tuple of (sum of Q, expected errors, bases >= Q20, bases >= Q30,
+        longest stretch with Q >= threshold)
+    """
+    if HAVE_NUMBA:
+        total, ee, n_q20, n_q30, best = _quality_stats_nb(q_int, int(threshold), _EE_LUT)
+        return int(total), float(ee), int(n_q20), int(n_q30), int(best)
+
+    if q_int.min() >= 0 and q_int.max() < len(_EE_LUT):
+        expected_errors = float(_EE_LUT[q_int].sum())
+    else:
+        expected_errors = float(np.sum(10 ** (-q_int.astype(float) / 10)))
+    return (
+        int(q_int.sum(dtype=np.int64)),
+        expected_errors,
+        int(np.count_nonzero(q_int >= 20)),
+        int(np.count_nonzero(q_int >= 30)),
+        _longest_hq_stretch(q_int, threshold),
+    )
+
+
 def _longest_hq_stretch(quals: list[int], threshold: int) -> int:
     """
     Find the longest contiguous stretch of bases with Q >= threshold.
 
+    Uses a Numba loop when Numba is installed, and a NumPy run-length
+    reduction otherwise.
+
     Args:
-        quals: List of phred quality scores
+        quals: Phred quality scores (list or integer array)
         threshold: Quality threshold
 
     Returns:
         Length of longest high-quality stretch
     """
-    if not quals:
+    if len(quals) == 0:
         return 0
 
-    max_len = 0
-    current_len = 0
+    q_int = np.asarray(quals, dtype=np.int32)
+    if HAVE_NUMBA:
+        return int(_longest_run_nb(q_int, int(threshold)))
 
-    for q in quals:
-        if q >= threshold:
-            current_len += 1
-            max_len = max(max_len, current_len)
-        else:
-            current_len = 0
+    hq = q_int >= threshold
+    return int(_longest_true_run(hq[np.newaxis, :])[0])
 
-    return max_len
 
+class SummaryAccumulator:
+    """
+    Running accumulator for compute_summary_stats.
 
-def compute_summary_stats(metrics_list: list[Dict[str, Any]]) -> Dict[str, Any]:
+    Keeps only the scalar per-read columns the summary needs (packed as
+    C doubles) rather than every metrics dict, so callers can stream rows
+    to disk and still produce the exact same summary. The values are kept,
+    not just running sums, because the summary reports medians. NaN metrics
+    (from compute_qc_metrics_failed) are left out of the quality averages.
     """
-    Compute aggregated summary statistics across all reads.
 
-    Args:
-        metrics_list: List of per-read metric dictionaries
+    _COLUMNS = (
+        "raw_length",
+        "trimmed_length",
+        "mean_q",
+        "pct_q20",
+        "pct_q30",
+        "gc_percent",
+        "expected_errors",
+    )
+
+    def __init__(self):
+        self._values = {name: array("d") for name in self._COLUMNS}
+        self.total_reads = 0
+        self.reads_passed = 0
+
+    def add(self, metrics: Dict[str, Any]) -> None:
+        """Add one per-read metrics dictionary."""
+        for name, values in self._values.items():
+            values.append(metrics[name])
+        self.total_reads += 1
+        if metrics["passed_minlen"] == "yes":
+            self.reads_passed += 1
+
+    def _column(self, name: str) -> np.ndarray:
+        return np.frombuffer(self._values[name], dtype=np.float64)
+
+    @staticmethod
+    def _mean(values: np.ndarray) -> float:
+        # NaN marks metrics skipped by compute_qc_metrics_failed
+        if not np.isnan(values).any():
+            return float(np.mean(values))
+        if np.isnan(values).all():
+            return 0.0
+        return float(np.nanmean(values))
+
+    @staticmethod
+    def _median(values: np.ndarray) -> float:
+        if not np.isnan(values).any():
+            return float(np.median(values))
+        if np.isnan(values).all():
+            return 0.0
+        return float(np.nanmedian(values))
+
+    def result(self) -> Dict[str, Any]:
+        """Return the summary statistics dictionary."""
+        if self.total_reads == 0:
+            return {
+                "total_reads": 0,
+                "mean_raw_length": 0.0,
+                "median_raw_length": 0.0,
+                "mean_trimmed_length": 0.0,
+                "median_trimmed_length": 0.0,
+                "mean_mean_q": 0.0,
+                "median_mean_q": 0.0,
+                "mean_pct_q20": 0.0,
+                "mean_pct_q30": 0.0,
+                "mean_gc_percent": 0.0,
+                "mean_expected_errors": 0.0,
+                "reads_passed_minlen": 0,
+                "reads_failed_minlen": 0,
+                "pct_passed": 0.0,
+            }
+
+        raw_lengths = self._column("raw_length")
+        trimmed_lengths = self._column("trimmed_length")
+        mean_qs = self._column("mean_q")
+
+        reads_passed = self.reads_passed
+        reads_failed = self.total_reads - reads_passed
+        pct_passed = 100.0 * reads_passed / self.total_reads
 
-    Returns:
-        Dictionary of summary statistics
-    """
-    if not metrics_list:
         return {
-            "total_reads": 0,
-            "mean_raw_length": 0.0,
-            "median_raw_length": 0.0,
-            "mean_trimmed_length": 0.0,
-            "median_trimmed_length": 0.0,
-            "mean_mean_q": 0.0,
-            "median_mean_q": 0.0,
-            "mean_pct_q20": 0.0,
-            "mean_pct_q30": 0.0,
-            "mean_gc_percent": 0.0,
-            "mean_expected_errors": 0.0,
-            "reads_passed_minlen": 0,
-            "reads_failed_minlen": 0,
-            "pct_passed": 0.0,
+            "total_reads": self.total_reads,
+            "mean_raw_length": round(float(np.mean(raw_lengths)), 2),
+            "median_raw_length": round(float(np.median(raw_lengths)), 2),
+            "mean_trimmed_length": round(float(np.mean(trimmed_lengths)), 2),
+            "median_trimmed_length": round(float(np.median(trimmed_lengths)), 2),
+            "mean_mean_q": round(self._mean(mean_qs), 2),
+            "median_mean_q": round(self._median(mean_qs), 2),
+            "mean_pct_q20": round(self._mean(self._column("pct_q20")), 4),
+            "mean_pct_q30": round(self._mean(self._column("pct_q30")), 4),
+            "mean_gc_percent": round(self._mean(self._column("gc_percent")), 2),
+            "mean_expected_errors": round(self._mean(self._column("expected_errors")), 2),
+            "reads_passed_minlen": reads_passed,
+            "reads_failed_minlen": reads_failed,
+            "pct_passed": round(pct_passed, 2),
         }
 
-    # Extract arrays
-    raw_lengths = np.array([m["raw_length"] for m in metrics_list])
-    trimmed_lengths = np.array([m["trimmed_length"] for m in metrics_list])
-    mean_qs = np.array([m["mean_q"] for m in metrics_list])
-    pct_q20s = np.array([m["pct_q20"] for m in metrics_list])
-    pct_q30s = np.array([m["pct_q30"] for m in metrics_list])
-    gc_percents = np.array([m["gc_percent"] for m in metrics_list])
-    expected_errors_list = np.array([m["expected_errors"] for m in metrics_list])
-    passed = [m["passed_minlen"] == "yes" for m in metrics_list]
 
-    reads_passed = sum(passed)
-    reads_failed = len(metrics_list) - reads_passed
-    pct_passed = 100.0 * reads_passed / len(metrics_list)
+def compute_summary_stats(metrics_list: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute aggregated summary statistics across all reads.
 
-    return {
-        "total_reads": len(metrics_list),
-        "mean_raw_length": round(float(np.mean(raw_lengths)), 2),
-        "median_raw_length": round(float(np.median(raw_lengths)), 2),
-        "mean_trimmed_length": round(float(np.mean(trimmed_lengths)), 2),
-        "median_trimmed_length": round(float(np.median(trimmed_lengths)), 2),
-        "mean_mean_q": round(float(np.mean(mean_qs)), 2),
-        "median_mean_q": round(float(np.median(mean_qs)), 2),
-        "mean_pct_q20": round(float(np.mean(pct_q20s)), 4),
-        "mean_pct_q30": round(float(np.mean(pct_q30s)), 4),
-        "mean_gc_percent": round(float(np.mean(gc_percents)), 2),
-        "mean_expected_errors": round(float(np.mean(expected_errors_list)), 2),
-        "reads_passed_minlen": reads_passed,
-        "reads_failed_minlen": reads_failed,
-        "pct_passed": round(pct_passed, 2),
-    }
+    Args:
+        metrics_list: Per-read metric dictionaries
+
+    Returns:
+        Dictionary of summary statistics
+    """
+    acc = SummaryAccumulator()
+    for metrics in metrics_list:
+        acc.add(metrics)
+    return acc.result()
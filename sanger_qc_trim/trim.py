@@ -1,6 +1,13 @@
 """Trimming algorithms for Sanger sequencing reads."""
 
-from typing import Tuple
+import logging
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+from ._jit import HAVE_NUMBA, njit
+
+logger = logging.getLogger(__name__)
 
 
 def trim_mott(quals: list[int], threshold: int) -> Tuple[int, int]:
@@ -21,31 +28,26 @@ def trim_mott(quals: list[int], threshold: int) -> Tuple[int, int]:
         >>> trim_mott([10, 10, 30, 30, 30, 10], 20)
         (2, 5)
     """
-    if not quals:
+    if len(quals) == 0:
         return (0, 0)
 
-    # Compute weights: positive if good, negative if bad
-    weights = [q - threshold for q in quals]
+    # Kadane with resets on prefix sums: the running sum at i is the prefix
+    # sum minus the smallest earlier prefix sum (int64, so uint8 can't wrap)
+    prefix = np.zeros(len(quals) + 1, dtype=np.int64)
+    np.cumsum(np.asarray(quals, dtype=np.int64) - threshold, out=prefix[1:])
+    gains = prefix[1:] - np.minimum.accumulate(prefix[:-1])
 
-    max_sum = 0
-    cur_sum = 0
-    best_start = 0
-    best_end = 0
-    cur_start = 0
+    # First window reaching the best score
+    last = int(np.argmax(gains))
+    if gains[last] <= 0:
+        return (0, 0)
 
-    for i, val in enumerate(weights):
-        cur_sum += val
-        if cur_sum <= 0:
-            # Reset the window
-            cur_sum = 0
-            cur_start = i + 1
-        elif cur_sum > max_sum:
-            # Found a better window
-            max_sum = cur_sum
-            best_start = cur_start
-            best_end = i + 1
+    # The window starts after the last time the running sum dropped to <= 0,
+    # i.e. at the last occurrence of the minimum prefix sum before it
+    before = prefix[:last + 1]
+    start = last - int(np.argmin(before[::-1]))
 
-    return (best_start, best_end)
+    return (start, last + 1)
 
 
 def trim_ends(quals: list[int], threshold: int) -> Tuple[int, int]:
@@ -65,12 +67,20 @@ def trim_ends(quals: list[int], threshold: int) -> Tuple[int, int]:
         >>> trim_ends([15, 25, 25, 15], 20)
         (1, 3)
     """
-    if not quals:
+    if len(quals) == 0:
         return (0, 0)
 
+    if isinstance(quals, np.ndarray):
+        # One vectorized comparison; cheaper than scanning array scalars
+        good = np.flatnonzero(quals >= threshold)
+        if good.size == 0:
+            return (0, 0)
+        return (int(good[0]), int(good[-1]) + 1)
+
     n = len(quals)
 
-    # Find first base with Q >= threshold
+    # Find first base with Q >= threshold (lists: stop at the first hit
+    # rather than converting the whole read)
     start = next((i for i, q in enumerate(quals) if q >= threshold), n)
 
     # Find last base with Q >= threshold
@@ -83,25 +93,123 @@ def trim_ends(quals: list[int], threshold: int) -> Tuple[int, int]:
     return (start, end + 1)  # Convert to [start, end) format
 
 
-def apply_trim(seq: str, quals: list[int], method: str, threshold: int) -> Tuple[str, list[int], int, int]:
+@njit(cache=True)
+def _mott_trim_nb(quals: np.ndarray, threshold: int) -> Tuple[int, int]:
+    """Compiled trim_mott over an int16 quality array."""
+    max_sum = 0
+    cur_sum = 0
+    best_start = 0
+    best_end = 0
+    cur_start = 0
+
+    for i in range(quals.shape[0]):
+        cur_sum += np.int64(quals[i]) - threshold
+        if cur_sum <= 0:
+            cur_sum = 0
+            cur_start = i + 1
+        elif cur_sum > max_sum:
+            max_sum = cur_sum
+            best_start = cur_start
+            best_end = i + 1
+
+    return best_start, best_end
+
+
+@njit(cache=True)
+def _ends_trim_nb(quals: np.ndarray, threshold: int) -> Tuple[int, int]:
+    """Compiled trim_ends over an int16 quality array."""
+    n = quals.shape[0]
+
+    start = 0
+    while start < n and quals[start] < threshold:
+        start += 1
+    if start >= n:
+        return 0, 0
+
+    end = n - 1
+    while quals[end] < threshold:
+        end -= 1
+
+    return start, end + 1
+
+
+def _compiled(kernel) -> Callable[[Sequence[int], int], Tuple[int, int]]:
+    """Wrap a Numba trimming kernel to take any quality sequence."""
+    def trimmer(quals: Sequence[int], threshold: int) -> Tuple[int, int]:
+        if len(quals) == 0:
+            return 0, 0
+        start, end = kernel(np.asarray(quals, dtype=np.int16), int(threshold))
+        return int(start), int(end)
+
+    return trimmer
+
+
+# Trimming method -> (quals, threshold) -> (start, end)
+_TRIMMERS: Dict[str, Callable[[Sequence[int], int], Tuple[int, int]]] = {
+    "mott": trim_mott,
+    "ends": trim_ends,
+}
+_COMPILED_TRIMMERS = {"mott": _compiled(_mott_trim_nb), "ends": _compiled(_ends_trim_nb)}
+
+
+def get_trimmer(method: str) -> Callable[[Sequence[int], int], Tuple[int, int]]:
+    """
+    Resolve a trimming method name to a ``(quals, threshold) -> (start, end)`` function.
+
+    The returned function uses the Numba kernel when Numba is installed,
+    and trim_mott/trim_ends otherwise; both give the same coordinates.
+    Resolve once and reuse it when trimming many reads with one method.
+
+    Args:
+        method: Trimming method ('mott' or 'ends')
+
+    Returns:
+        Trimming function returning 0-based [start, end) indices
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    trimmers = _COMPILED_TRIMMERS if HAVE_NUMBA else _TRIMMERS
+    try:
+        return trimmers[method]
+    except KeyError:
+        raise ValueError(f"Unknown trimming method: {method}") from None
+
+
+def warmup() -> None:
+    """
+    Compile the Numba trimming kernels ahead of the per-file loop.
+
+    No-op when Numba is not installed. With ``cache=True`` the compiled
+    code is reused from disk after the first run.
+    """
+    if not HAVE_NUMBA:
+        return
+    try:
+        apply_trim("A" * 32, [20] * 32, "mott", 20)
+        apply_trim("A" * 32, [20] * 32, "ends", 20)
+    except Exception as e:  # pragma: no cover - compile failures are environment-specific
+        logger.debug(f"Numba trimming warmup failed: {e}")
+
+
+def apply_trim(seq: str, quals: Sequence[int], method: str, threshold: int) -> Tuple[str, Sequence[int], int, int]:
     """
     Apply trimming to a sequence and return trimmed results.
 
+    Uses the Numba kernels when Numba is installed, and trim_mott/trim_ends
+    otherwise; both give the same coordinates. See get_trimmer.
+
     Args:
         seq: DNA sequence string
-        quals: List of phred quality scores
+        quals: Phred quality scores (list or integer array)
         method: Trimming method ('mott' or 'ends')
         threshold: Quality threshold
 
     Returns:
-        Tuple of (trimmed_seq, trimmed_quals, trim_start, trim_end)
+        Tuple of (trimmed_seq, trimmed_quals, trim_start, trim_end);
+        trimmed_quals has the same type as quals
     """
-    if method == "mott":
-        trim_start, trim_end = trim_mott(quals, threshold)
-    elif method == "ends":
-        trim_start, trim_end = trim_ends(quals, threshold)
-    else:
-        raise ValueError(f"Unknown trimming method: {method}")
+    trim_start, trim_end = get_trimmer(method)(quals, threshold)
 
     trimmed_seq = seq[trim_start:trim_end]
     trimmed_quals = quals[trim_start:trim_end]
@@ -1,48 +1,154 @@
 """Output writers for QC metrics and trimmed sequences."""
 
+import csv
 import gzip
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Union
+import numpy as np
 import pandas as pd
 
+try:  # Optional ISA-L gzip (pip install ".[fast]")
+    from isal import igzip
+except ImportError:  # pragma: no cover - depends on the environment
+    igzip = None
+
 logger = logging.getLogger(__name__)
 
 
+# Rows buffered before each Parquet row group is flushed
+PARQUET_BATCH_ROWS = 1024
+BASE_CALL_ROW_GROUP_ROWS = 65536
+
+# Phred score -> FASTQ (Sanger, offset 33) quality character
+_PHRED_LUT = bytes((q + 33) & 0xFF for q in range(256))
+
+
+def _open_gz(path: Path):
+    """
+    Open ``path`` for gzip writing at level 1 (speed over size).
+
+    Uses python-isal's ISA-L deflate when installed and the standard
+    library gzip module otherwise. Both write ordinary gzip files.
+    """
+    if igzip is not None:
+        return igzip.open(path, "wb", compresslevel=1)
+    return gzip.open(path, "wb", compresslevel=1)
+
+
+class QCMetricsWriter:
+    """
+    Incremental writer for per-read QC metrics (CSV and Parquet).
+
+    Rows are written as they arrive so callers need not hold every metrics
+    dict in memory. Files are created lazily on the first row, so nothing
+    is written for an empty run. Use via open_qc_metrics().
+    """
+
+    def __init__(self, output_dir: Path):
+        self.qc_dir = output_dir / "qc"
+        self.csv_path = self.qc_dir / "per_read_metrics.csv"
+        self.parquet_path = self.qc_dir / "per_read_metrics.parquet"
+        self.count = 0
+        self._csv_file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._parquet_ok = True
+        self._pending: List[Dict[str, Any]] = []
+
+    def write(self, metrics: Dict[str, Any]) -> None:
+        """Append one per-read metrics dict."""
+        if self._csv_writer is None:
+            self.qc_dir.mkdir(parents=True, exist_ok=True)
+            self._csv_file = open(self.csv_path, "w", newline="")
+            self._csv_writer = csv.DictWriter(
+                self._csv_file, fieldnames=list(metrics), lineterminator="\n"
+            )
+            self._csv_writer.writeheader()
+
+        # Write NaN as an empty field, as DataFrame.to_csv does
+        self._csv_writer.writerow({
+            k: "" if isinstance(v, float) and v != v else v for k, v in metrics.items()
+        })
+        self.count += 1
+
+        if self._parquet_ok:
+            self._pending.append(metrics)
+            if len(self._pending) >= PARQUET_BATCH_ROWS:
+                self._flush_parquet()
+
+    def _flush_parquet(self) -> None:
+        if not self._pending:
+            return
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet_writer is None:
+                table = pa.Table.from_pylist(self._pending)
+                self._parquet_writer = pq.ParquetWriter(self.parquet_path, table.schema)
+            else:
+                table = pa.Table.from_pylist(
+                    self._pending, schema=self._parquet_writer.schema
+                )
+            self._parquet_writer.write_table(table)
+        except Exception as e:
+            logger.warning(f"Failed to write Parquet file: {e}")
+            self._parquet_ok = False
+        self._pending = []
+
+    def close(self) -> None:
+        """Flush buffered rows and close both files."""
+        if self._csv_file is None:
+            logger.warning("No metrics to write")
+            return
+
+        self._csv_file.close()
+        self._csv_file = None
+        logger.info(f"Wrote per-read metrics CSV: {self.csv_path}")
+
+        if self._parquet_ok:
+            self._flush_parquet()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+            if self._parquet_ok:
+                logger.info(f"Wrote per-read metrics Parquet: {self.parquet_path}")
+
+    def __enter__(self) -> "QCMetricsWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_qc_metrics(output_dir: Path) -> QCMetricsWriter:
+    """
+    Open a streaming per-read QC metrics writer.
+
+    Args:
+        output_dir: Output directory (files go to ``output_dir/qc``)
+
+    Returns:
+        QCMetricsWriter usable as a context manager
+    """
+    return QCMetricsWriter(output_dir)
+
+
 def write_qc_metrics(
-    metrics_list: List[Dict[str, Any]], output_dir: Path
+    metrics_list: Iterable[Dict[str, Any]], output_dir: Path
 ) -> None:
     """
     Write per-read QC metrics to CSV and Parquet files.
 
     Args:
-        metrics_list: List of per-read metric dictionaries
+        metrics_list: Per-read metric dictionaries
         output_dir: Output directory
     """
-    if not metrics_list:
-        logger.warning("No metrics to write")
-        return
-
-    # Create output directory
-    qc_dir = output_dir / "qc"
-    qc_dir.mkdir(parents=True, exist_ok=True)
-
-    # Convert to DataFrame
-    df = pd.DataFrame(metrics_list)
-
-    # Write CSV
-    csv_path = qc_dir / "per_read_metrics.csv"
-    df.to_csv(csv_path, index=False)
-    logger.info(f"Wrote per-read metrics CSV: {csv_path}")
-
-    # Write Parquet
-    try:
-        parquet_path = qc_dir / "per_read_metrics.parquet"
-        df.to_parquet(parquet_path, index=False, engine="pyarrow")
-        logger.info(f"Wrote per-read metrics Parquet: {parquet_path}")
-    except Exception as e:
-        logger.warning(f"Failed to write Parquet file: {e}")
+    with open_qc_metrics(output_dir) as writer:
+        for metrics in metrics_list:
+            writer.write(metrics)
 
 
 def write_summary_stats(summary: Dict[str, Any], output_dir: Path) -> None:
@@ -65,88 +171,193 @@ def write_summary_stats(summary: Dict[str, Any], output_dir: Path) -> None:
     logger.info(f"Wrote summary statistics: {json_path}")
 
 
-def write_trimmed_fastq(
-    sequences: List[Dict[str, Any]], output_path: Path
-) -> None:
+class TrimmedSequenceWriter:
     """
-    Write trimmed sequences to FASTQ file (gzipped).
+    Incremental gzipped FASTQ/FASTA writer for trimmed reads.
+
+    The file is opened lazily on the first record, so nothing is created
+    when no reads are written. Records are joined and compressed in chunks
+    of ``CHUNK_RECORDS``, at gzip level 1 (speed over size). Use via
+    open_trimmed_fastq() or open_trimmed_fasta().
+    """
+
+    CHUNK_RECORDS = 1024
+
+    def __init__(self, output_path: Path, fmt: str = "fastq"):
+        if fmt not in ("fastq", "fasta"):
+            raise ValueError(f"Unknown sequence format: {fmt}")
+        self.output_path = output_path
+        self.fmt = fmt
+        self.count = 0
+        self._handle = None
+        self._pending: List[bytes] = []
+
+    def write(self, seq_dict: Dict[str, Any]) -> None:
+        """
+        Append one record.
+
+        Args:
+            seq_dict: Dictionary with keys 'read_id', 'seq' and (for FASTQ)
+                      'quals'
+        """
+        if self._handle is None:
+            # Ensure parent directory exists
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Binary mode: records are assembled as bytes, no text layer
+            self._handle = _open_gz(self.output_path)
+
+        read_id = seq_dict["read_id"].encode()
+        seq = seq_dict["seq"].encode()
+
+        if self.fmt == "fastq":
+            # Convert quality scores to ASCII with one C-level table lookup
+            quals = seq_dict["quals"]
+            if isinstance(quals, np.ndarray):
+                quals = np.asarray(quals, dtype=np.uint8).tobytes()
+            qual_bytes = bytes(quals).translate(_PHRED_LUT)
+            self._pending.append(b"@%s\n%s\n+\n%s\n" % (read_id, seq, qual_bytes))
+        else:
+            self._pending.append(b">%s\n%s\n" % (read_id, seq))
+        self.count += 1
+        if len(self._pending) >= self.CHUNK_RECORDS:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._handle.write(b"".join(self._pending))
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        label = self.fmt.upper()
+        if self._handle is None:
+            logger.warning(f"No sequences to write to {label}")
+            return
+
+        self._flush()
+        self._handle.close()
+        self._handle = None
+        logger.info(f"Wrote {self.count} trimmed sequences to {label}: {self.output_path}")
+
+    def __enter__(self) -> "TrimmedSequenceWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_trimmed_fastq(output_path: Path) -> TrimmedSequenceWriter:
+    """
+    Open a streaming gzipped FASTQ writer for trimmed reads.
 
     Args:
-        sequences: List of sequence dictionaries with keys:
-                   'read_id', 'seq', 'quals'
         output_path: Output FASTQ path (will be gzipped)
+
+    Returns:
+        TrimmedSequenceWriter usable as a context manager
     """
-    if not sequences:
-        logger.warning("No sequences to write to FASTQ")
-        return
+    return TrimmedSequenceWriter(output_path, "fastq")
 
-    # Ensure parent directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write gzipped FASTQ
-    with gzip.open(output_path, "wt") as f:
-        for seq_dict in sequences:
-            read_id = seq_dict["read_id"]
-            seq = seq_dict["seq"]
-            quals = seq_dict["quals"]
+def open_trimmed_fasta(output_path: Path) -> TrimmedSequenceWriter:
+    """
+    Open a streaming gzipped FASTA writer for trimmed reads.
 
-            # Convert quality scores to ASCII
-            qual_string = "".join(chr(q + 33) for q in quals)
+    Args:
+        output_path: Output FASTA path (will be gzipped)
 
-            # Write FASTQ record
-            f.write(f"@{read_id}\n")
-            f.write(f"{seq}\n")
-            f.write("+\n")
-            f.write(f"{qual_string}\n")
+    Returns:
+        TrimmedSequenceWriter usable as a context manager
+    """
+    return TrimmedSequenceWriter(output_path, "fasta")
 
-    logger.info(f"Wrote {len(sequences)} trimmed sequences to FASTQ: {output_path}")
+
+def write_trimmed_fastq(
+    sequences: Iterable[Dict[str, Any]], output_path: Path
+) -> None:
+    """
+    Write trimmed sequences to FASTQ file (gzipped).
+
+    Args:
+        sequences: Sequence dictionaries with keys:
+                   'read_id', 'seq', 'quals'
+        output_path: Output FASTQ path (will be gzipped)
+    """
+    with open_trimmed_fastq(output_path) as writer:
+        for seq_dict in sequences:
+            writer.write(seq_dict)
 
 
 def write_trimmed_fasta(
-    sequences: List[Dict[str, Any]], output_path: Path
+    sequences: Iterable[Dict[str, Any]], output_path: Path
 ) -> None:
     """
     Write trimmed sequences to FASTA file (gzipped).
 
     Args:
-        sequences: List of sequence dictionaries with keys:
+        sequences: Sequence dictionaries with keys:
                    'read_id', 'seq'
         output_path: Output FASTA path (will be gzipped)
     """
-    if not sequences:
-        logger.warning("No sequences to write to FASTA")
-        return
+    with open_trimmed_fasta(output_path) as writer:
+        for seq_dict in sequences:
+            writer.write(seq_dict)
 
-    # Ensure parent directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Write gzipped FASTA
-    with gzip.open(output_path, "wt") as f:
-        for seq_dict in sequences:
-            read_id = seq_dict["read_id"]
-            seq = seq_dict["seq"]
+CSV_ENGINES = ("pandas", "pyarrow")
+
+
+def _write_csv(df: pd.DataFrame, dest, header: bool = True, engine: str = "pandas") -> None:
+    """
+    Write ``df`` without its index to a path or binary file object.
 
-            # Write FASTA record
-            f.write(f">{read_id}\n")
-            f.write(f"{seq}\n")
+    The "pandas" engine is DataFrame.to_csv. The "pyarrow" engine uses
+    pyarrow's C++ CSV writer, several times faster on large tables, but
+    it quotes every string value and writes whole floats without ".0";
+    the parsed values are the same.
+    """
+    if engine == "pandas":
+        df.to_csv(dest, index=False, header=header)
+    elif engine == "pyarrow":
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        pacsv.write_csv(
+            pa.Table.from_pandas(df, preserve_index=False), dest,
+            write_options=pacsv.WriteOptions(include_header=header),
+        )
+    else:
+        raise ValueError(f"Unknown CSV engine: {engine}")
 
-    logger.info(f"Wrote {len(sequences)} trimmed sequences to FASTA: {output_path}")
+
+def _base_call_parquet_compression(pa) -> Dict[str, Any]:
+    """
+    ParquetWriter compression options for base-call tables.
+
+    zstd level 3 roughly halves the snappy file size of these repetitive
+    string-heavy tables at about the same write speed. Falls back to
+    pyarrow's default (snappy) when zstd is not built in.
+    """
+    if pa.Codec.is_available("zstd"):
+        return {"compression": "zstd", "compression_level": 3}
+    return {}
 
 
 def write_base_call_annotations(
     sample_id: str,
-    annotations: List[Dict[str, Any]],
-    output_dir: Path
+    annotations: Union[pd.DataFrame, List[Dict[str, Any]]],
+    output_dir: Path,
+    csv_engine: str = "pandas",
 ) -> None:
     """
     Write per-base call annotations to CSV file.
 
     Args:
         sample_id: Sample identifier
-        annotations: List of per-base annotation dictionaries
+        annotations: Annotation table or list of per-base annotation dictionaries
         output_dir: Output directory
+        csv_engine: "pandas" (default) or "pyarrow", see _write_csv
     """
-    if not annotations:
+    if len(annotations) == 0:
         logger.warning(f"No base call annotations to write for {sample_id}")
         return
 
@@ -154,29 +365,48 @@ def write_base_call_annotations(
     base_calls_dir = output_dir / "base_calls"
     base_calls_dir.mkdir(parents=True, exist_ok=True)
 
-    # Convert to DataFrame
-    df = pd.DataFrame(annotations)
+    csv_path = base_calls_dir / f"{sample_id}_base_calls.csv"
 
-    # Add sample_id column
-    df.insert(0, 'sample_id', sample_id)
+    if csv_engine == "pandas" and not isinstance(annotations, pd.DataFrame):
+        # A read's worth of dicts: write rows directly rather than build a
+        # DataFrame. Columns are the union of keys in first-seen order and
+        # NaN/None become empty fields, as with DataFrame.to_csv.
+        fieldnames = ['sample_id'] + list(dict.fromkeys(k for row in annotations for k in row))
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+            writer.writeheader()
+            for row in annotations:
+                writer.writerow({
+                    'sample_id': sample_id,
+                    **{k: "" if isinstance(v, float) and v != v else v for k, v in row.items()},
+                })
+    else:
+        # Convert to DataFrame
+        df = pd.DataFrame(annotations).copy()
 
-    # Write CSV
-    csv_path = base_calls_dir / f"{sample_id}_base_calls.csv"
-    df.to_csv(csv_path, index=False)
+        # Add sample_id column
+        df.insert(0, 'sample_id', sample_id)
+
+        _write_csv(df, csv_path, engine=csv_engine)
     logger.info(f"Wrote base call annotations: {csv_path}")
 
 
 def write_all_base_call_annotations(
-    annotations_dict: Dict[str, List[Dict[str, Any]]],
-    output_dir: Path
+    annotations_dict: Dict[str, Union[pd.DataFrame, List[Dict[str, Any]]]],
+    output_dir: Path,
+    csv_engine: str = "pandas",
 ) -> None:
     """
     Write all per-base call annotations to a single combined CSV file.
 
     Args:
-        annotations_dict: Dictionary mapping sample_id -> annotation list
+        annotations_dict: Dictionary mapping sample_id -> annotation table
+            (or list of annotation dictionaries)
         output_dir: Output directory
+        csv_engine: "pandas" (default) or "pyarrow", see _write_csv
     """
+    if csv_engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine: {csv_engine}")
     if not annotations_dict:
         logger.warning("No base call annotations to write")
         return
@@ -185,34 +415,53 @@ def write_all_base_call_annotations(
     base_calls_dir = output_dir / "base_calls"
     base_calls_dir.mkdir(parents=True, exist_ok=True)
 
-    # Combine all annotations
-    all_annotations = []
-    for sample_id, annotations in annotations_dict.items():
-        for annotation in annotations:
-            # Add sample_id to each annotation
-            ann_copy = annotation.copy()
-            ann_copy['sample_id'] = sample_id
-            all_annotations.append(ann_copy)
-
-    # Convert to DataFrame
-    df = pd.DataFrame(all_annotations)
-
-    # Reorder columns to have sample_id first
-    cols = ['sample_id'] + [col for col in df.columns if col != 'sample_id']
-    df = df[cols]
-
-    # Write CSV
+    # Concatenate and write samples in groups of about BASE_CALL_ROW_GROUP_ROWS
+    # rows (one Parquet row group each) instead of one table for the whole run
     csv_path = base_calls_dir / "all_base_calls.csv"
-    df.to_csv(csv_path, index=False)
+    parquet_path = base_calls_dir / "all_base_calls.parquet"
+    parquet_writer = None
+    parquet_ok = True
+
+    def write_group(group: List[pd.DataFrame], first: bool) -> None:
+        nonlocal parquet_writer, parquet_ok
+        df = pd.concat(group, ignore_index=True)
+        _write_csv(df, csv_file, header=first, engine=csv_engine)
+        if not parquet_ok:
+            return
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if parquet_writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                parquet_writer = pq.ParquetWriter(
+                    parquet_path, table.schema, **_base_call_parquet_compression(pa)
+                )
+            else:
+                table = pa.Table.from_pandas(df, schema=parquet_writer.schema, preserve_index=False)
+            parquet_writer.write_table(table)
+        except Exception as e:
+            logger.warning(f"Failed to write Parquet file: {e}")
+            parquet_ok = False
+
+    with open(csv_path, "wb") as csv_file:
+        group, group_rows, first = [], 0, True
+        for sample_id, annotations in annotations_dict.items():
+            frame = pd.DataFrame(annotations).copy()
+            frame.insert(0, 'sample_id', sample_id)
+            group.append(frame)
+            group_rows += len(frame)
+            if group_rows >= BASE_CALL_ROW_GROUP_ROWS:
+                write_group(group, first)
+                group, group_rows, first = [], 0, False
+        if group:
+            write_group(group, first)
+
+    if parquet_writer is not None:
+        parquet_writer.close()
     logger.info(f"Wrote combined base call annotations: {csv_path}")
-
-    # Also write Parquet for efficient storage
-    try:
-        parquet_path = base_calls_dir / "all_base_calls.parquet"
-        df.to_parquet(parquet_path, index=False, engine="pyarrow")
+    if parquet_ok:
         logger.info(f"Wrote base call annotations Parquet: {parquet_path}")
-    except Exception as e:
-        logger.warning(f"Failed to write Parquet file: {e}")
 
 
 def setup_logging(output_dir: Path, verbose: bool = False, quiet: bool = False) -> None:
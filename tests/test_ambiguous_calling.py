@@ -7,8 +7,13 @@ from sanger_qc_trim.ambiguous_calling import (
     AmbiguousCallingConfig,
     AmbiguousBaseCaller,
     BaseCall,
+    BaseCallArray,
     PeakIntensityExtractor,
     IUPAC_CODES,
+    CALL_MODES,
+    FLAG_SETS,
+    batch_call_files,
+    clear_trace_cache,
     create_ambiguous_caller,
 )
 
@@ -193,6 +198,60 @@ class TestAmbiguousBaseCaller:
         assert mode == 'N'
         assert 'unclear_primary' in flags
 
+    @pytest.mark.parametrize("clonal", [True, False])
+    def test_classify_batch_matches_numpy_path(self, clonal, monkeypatch):
+        """Test the compiled classifier agrees with the NumPy path."""
+        from sanger_qc_trim import ambiguous_calling
+
+        caller = AmbiguousBaseCaller(AmbiguousCallingConfig(clonal_context=clonal))
+        rng = np.random.default_rng(0)
+        n = 500
+        args = (
+            rng.integers(0, 4, n), rng.integers(0, 4, n),
+            rng.uniform(0, 1000, n).astype(np.float32),
+            rng.uniform(0, 1000, n).astype(np.float32),
+            rng.uniform(0, 1.2, n), rng.uniform(0, 10, n),
+            rng.integers(0, 60, n).astype(np.int16),
+        )
+
+        monkeypatch.setattr(ambiguous_calling, 'HAVE_NUMBA', True)
+        compiled = caller._classify(*args)
+        monkeypatch.setattr(ambiguous_calling, 'HAVE_NUMBA', False)
+        vectorized = caller._classify(*args)
+
+        for got, expected in zip(compiled, vectorized):
+            np.testing.assert_array_equal(got, expected)
+
+    @pytest.mark.parametrize("clonal", [True, False])
+    def test_classify_matches_scalar_rules(self, clonal):
+        """Vectorized classifier agrees with the scalar 6-rule criteria."""
+        caller = AmbiguousBaseCaller(AmbiguousCallingConfig(clonal_context=clonal))
+
+        spr_values = [0.0, 0.1, 0.2, 0.25, 0.33, 0.5, 0.67, 0.75, 0.85, 0.9]
+        snr_values = [3.0, 4.0, 10.0]
+        q_values = [10, 12, 20, 25, 30, 35]
+        grid = np.array(
+            [(spr, snr, q) for spr in spr_values for snr in snr_values for q in q_values]
+        )
+        spr, snr, quality = grid[:, 0], grid[:, 1], grid[:, 2].astype(int)
+        H1 = np.full(len(grid), 100.0)
+        H2 = H1 * spr
+        prim_idx = np.zeros(len(grid), dtype=int)      # A
+        sec_idx = np.full(len(grid), 2, dtype=int)     # G
+
+        called, mode, allele_frac, flag_code = caller._classify(
+            prim_idx, sec_idx, H1, H2, spr, snr, quality
+        )
+
+        for i in range(len(grid)):
+            expected = caller._apply_calling_criteria(
+                'A', 'G', H1[i], H2[i], spr[i], snr[i], int(quality[i])
+            )
+            assert chr(called[i]) == expected[0]
+            assert CALL_MODES[mode[i]] == expected[1]
+            assert allele_frac[i] == pytest.approx(expected[2])
+            assert list(FLAG_SETS[flag_code[i]]) == expected[3]
+
     def test_base_calls_to_sequence(self):
         """Test converting base calls to sequence string."""
         caller = AmbiguousBaseCaller()
@@ -202,8 +261,10 @@ class TestAmbiguousBaseCaller:
             BaseCall(2, 'C', 'C', 'T', 100, 15, 0.15, 10, 35, 'single', 0.87, []),
             BaseCall(3, 'N', 'A', 'G', 50, 45, 0.90, 3, 10, 'N', 0.53, ['unclear_primary']),
         ]
-        seq = caller.base_calls_to_sequence(base_calls)
+        with pytest.warns(DeprecationWarning):
+            seq = caller.base_calls_to_sequence(base_calls)
         assert seq == 'ARCN'
+        assert caller.base_calls_to_sequence(BaseCallArray.from_base_calls(base_calls)) == 'ARCN'
 
     def test_base_calls_to_annotations(self):
         """Test converting base calls to annotation dictionaries."""
@@ -228,6 +289,106 @@ class TestAmbiguousBaseCaller:
         assert annotations[1]['call_mode'] == 'ambiguous'
         assert annotations[1]['flags'] == 'heterozygous'
 
+    def test_calculate_snr_vectorized(self):
+        """Test SNR uses the median baseline around each peak."""
+        caller = AmbiguousBaseCaller()
+        trace = np.full(60, 10.0)
+        traces = {
+            'A': trace, 'C': trace, 'G': trace, 'T': trace,
+            'peak_locations': np.array([30, 0])
+        }
+
+        snr = caller._calculate_snr(traces, np.array([500.0, 200.0, 100.0]))
+
+        # Baseline is 10 everywhere; third position has no peak location
+        assert list(snr) == [50.0, 20.0, 0.0]
+
+    def test_skip_low_quality_matches_full_calling(self):
+        """Test skipped low-quality positions are Ns and the rest are unchanged."""
+        rng = np.random.default_rng(1)
+        traces = {base: rng.integers(0, 2000, 400).astype(np.float32) for base in 'ACGT'}
+        traces['peak_locations'] = np.arange(10, 390, 10)
+        sequence = 'ACGT' * 10
+        qualities = rng.integers(0, 60, len(sequence)).tolist()
+
+        full = AmbiguousBaseCaller()
+        skipping = AmbiguousBaseCaller(AmbiguousCallingConfig(skip_low_quality=True))
+        for caller in (full, skipping):
+            caller.extractor.extract_traces = lambda path: traces
+
+        expected = full.call_bases(Path('read.ab1'), sequence, qualities)
+        got = skipping.call_bases(Path('read.ab1'), sequence, qualities)
+
+        low = np.asarray(qualities) < skipping.config.q_min_noise
+        assert low.any() and not low.all()
+        np.testing.assert_array_equal(got.called_base, expected.called_base)
+        np.testing.assert_array_equal(got.flag_code, expected.flag_code)
+        np.testing.assert_array_equal(got.snr[~low], expected.snr[~low])
+        np.testing.assert_array_equal(got.spr[~low], expected.spr[~low])
+        assert not got.primary_intensity[low].any()
+        assert not got.snr[low].any()
+
+    def test_calculate_snr_reuses_scratch(self):
+        """Test the noise scratch buffer is reused for shorter reads."""
+        caller = AmbiguousBaseCaller()
+        trace = np.full(100, 10.0, dtype=np.float32)
+        traces = {base: trace for base in 'ACGT'}
+
+        traces['peak_locations'] = np.array([30, 50, 70])
+        first = caller._calculate_snr(traces, np.array([500.0, 200.0, 100.0]))
+        buffer = caller._noise_samples
+
+        traces['peak_locations'] = np.array([40])
+        second = caller._calculate_snr(traces, np.array([300.0]))
+
+        assert caller._noise_samples is buffer
+        assert first.tolist() == [50.0, 20.0, 10.0]
+        assert second.tolist() == [30.0]
+
+    def test_trim_bounds_only_calls_kept_region(self):
+        """Test positions outside trim_bounds are trimmed Ns."""
+        rng = np.random.default_rng(2)
+        traces = {base: rng.integers(0, 2000, 400).astype(np.float32) for base in 'ACGT'}
+        traces['peak_locations'] = np.arange(10, 390, 10)
+        sequence = 'ACGT' * 10
+        qualities = [40] * len(sequence)
+
+        caller = AmbiguousBaseCaller()
+        caller.extractor.extract_traces = lambda path: traces
+
+        full = caller.call_bases(Path('read.ab1'), sequence, qualities)
+        bounded = caller.call_bases(Path('read.ab1'), sequence, qualities,
+                                    trim_bounds=(5, 30))
+
+        assert bounded.sequence[5:30] == full.sequence[5:30]
+        assert bounded.sequence[:5] + bounded.sequence[30:] == 'N' * 15
+        assert all(bc.flags == ['trimmed'] for bc in bounded[:5])
+        assert all(bc.flags == ['trimmed'] for bc in bounded[30:])
+        np.testing.assert_array_equal(bounded.snr[5:30], full.snr[5:30])
+        assert not bounded.primary_intensity[30:].any()
+
+    def test_erne_trim_end(self):
+        """Test the running-sum trimmer keeps the best-scoring prefix."""
+        quals = [30, 30, 30, 10, 10, 30, 5, 5, 5, 5]
+        # running sums of q - 20: 10, 20, 30, 20, 10, 20, 5, -10, -25, -40
+        assert AmbiguousBaseCaller.erne_trim_end(quals, 20) == 3
+        assert AmbiguousBaseCaller.erne_trim_end([5, 5], 20) == 0
+        assert AmbiguousBaseCaller.erne_trim_end([], 20) == 0
+
+    def test_trim_bounds_auto(self):
+        """Test trim_bounds='auto' trims the 3' tail found by erne_trim_end."""
+        traces = {base: np.full(200, 10.0, dtype=np.float32) for base in 'ACGT'}
+        traces['peak_locations'] = np.arange(10, 190, 20)
+        sequence = 'ACGTACGTA'
+        qualities = [40, 40, 40, 40, 40, 40, 5, 5, 5]
+
+        caller = AmbiguousBaseCaller()
+        caller.extractor.extract_traces = lambda path: traces
+        base_calls = caller.call_bases(Path('read.ab1'), sequence, qualities, trim_bounds='auto')
+
+        assert [bc.flags for bc in base_calls[6:]] == [['trimmed']] * 3
+        assert 'trimmed' not in base_calls[5].flags
+
     def test_fallback_calling_high_quality(self):
         """Test fallback calling with high quality bases."""
         caller = AmbiguousBaseCaller()
@@ -273,6 +434,15 @@ class TestAmbiguousBaseCaller:
             assert 'moderate_quality' in bc.flags
             assert 'no_trace_data' in bc.flags
 
+    def test_fallback_calling_short_qualities(self):
+        """Test missing qualities are treated as Q0."""
+        caller = AmbiguousBaseCaller()
+
+        base_calls = caller._fallback_calling("ACGT", [35, 35])
+
+        assert caller.base_calls_to_sequence(base_calls) == 'ACNN'
+        assert base_calls.quality.tolist() == [35, 35, 0, 0]
+
 
 class TestPeakIntensityExtractor:
     """Test peak intensity extraction (limited without real AB1 files)."""
@@ -293,7 +463,8 @@ class TestPeakIntensityExtractor:
         intensities = extractor.get_intensities_at_position(traces, 0, window=1)
 
         # Should return zeros when no peak locations
-        assert intensities == {'A': 0.0, 'C': 0.0, 'G': 0.0, 'T': 0.0}
+        assert intensities.shape == (4,)
+        assert intensities.tolist() == [0.0, 0.0, 0.0, 0.0]
 
     def test_get_intensities_with_peak_locations(self):
         """Test intensity extraction with peak location data."""
@@ -311,10 +482,173 @@ class TestPeakIntensityExtractor:
         intensities = extractor.get_intensities_at_position(traces, 0, window=1)
 
         # Should integrate around position 2 with window=1 (positions 1,2,3)
-        assert intensities['A'] == 20 + 100 + 20  # 140
-        assert intensities['C'] == 10 + 50 + 10   # 70
-        assert intensities['G'] == 16 + 80 + 16   # 112
-        assert intensities['T'] == 6 + 30 + 6     # 42
+        # Rows are ordered A, C, G, T
+        assert intensities[0] == 20 + 100 + 20  # 140
+        assert intensities[1] == 10 + 50 + 10   # 70
+        assert intensities[2] == 16 + 80 + 16   # 112
+        assert intensities[3] == 6 + 30 + 6     # 42
+
+        # With precomputed sums the column is returned as a view
+        sums = extractor.precompute_window_sums(traces, window=1)
+        column = extractor.get_intensities_at_position(traces, 0, window_sums=sums)
+        assert column.tolist() == intensities.tolist()
+        assert np.shares_memory(column, sums)
+
+    def test_extract_traces_cached_per_file(self, tmp_path, monkeypatch):
+        """Test repeated extraction of an unchanged file parses it once."""
+        from sanger_qc_trim import ambiguous_calling
+
+        calls = []
+
+        def fake_load(path):
+            calls.append(path)
+            return {base: np.ones(5, dtype=np.float32) for base in 'ACGT'}
+
+        monkeypatch.setattr(ambiguous_calling, '_load_traces', fake_load)
+        ab1_path = tmp_path / "read.ab1"
+        ab1_path.write_bytes(b"ABIF")
+
+        clear_trace_cache()
+        try:
+            first = PeakIntensityExtractor.extract_traces(ab1_path)
+            second = PeakIntensityExtractor.extract_traces(ab1_path)
+        finally:
+            clear_trace_cache()
+
+        assert len(calls) == 1
+        assert first is second
+        assert not first['A'].flags.writeable
+
+    def test_extract_traces_failures_not_cached(self, tmp_path, monkeypatch):
+        """Test a failed read is retried on the next call."""
+        from sanger_qc_trim import ambiguous_calling
+
+        calls = []
+
+        def failing_load(path):
+            calls.append(path)
+            return None
+
+        monkeypatch.setattr(ambiguous_calling, '_load_traces', failing_load)
+        ab1_path = tmp_path / "broken.ab1"
+        ab1_path.write_bytes(b"ABIF")
+
+        clear_trace_cache()
+        try:
+            assert PeakIntensityExtractor.extract_traces(ab1_path) is None
+            assert PeakIntensityExtractor.extract_traces(ab1_path) is None
+        finally:
+            clear_trace_cache()
+
+        assert len(calls) == 2
+
+    @staticmethod
+    def _write_abif(path, tags):
+        """Write a minimal ABIF file holding the given short-array tags."""
+        import struct
+
+        payload = b''
+        entries = b''
+        data_start = 128
+        for name, number, values in tags:
+            raw = struct.pack(f'>{len(values)}h', *values)
+            if len(raw) <= 4:
+                # Small payloads live in the data offset field itself
+                offset, = struct.unpack('>i', raw.ljust(4, b'\0'))
+            else:
+                offset = data_start + len(payload)
+                payload += raw
+            entries += struct.pack('>4sihhiiii', name, number, 4, 2, len(values),
+                                   len(raw), offset, 0)
+        dir_offset = data_start + len(payload)
+        header = b'ABIF' + struct.pack('>h', 101) + struct.pack(
+            '>4sihhiiii', b'tdir', 1, 1023, 28, len(tags), len(entries), dir_offset, 0
+        )
+        path.write_bytes(header.ljust(data_start, b'\0') + payload + entries)
+
+    @staticmethod
+    def _channel_tags():
+        return [(b'DATA', 9 + i, [i + 1, i + 2, i + 3]) for i in range(4)]
+
+    def test_read_abif_channels(self, tmp_path):
+        """Test the direct ABIF reader on a minimal synthetic file."""
+        from sanger_qc_trim.ambiguous_calling import _read_abif_channels
+
+        ab1_path = tmp_path / "synthetic.ab1"
+        self._write_abif(ab1_path, self._channel_tags() + [(b'PLOC', 2, [1, 2, 5])])
+
+        traces = _read_abif_channels(ab1_path)
+
+        assert traces['A'].tolist() == [1.0, 2.0, 3.0]
+        assert traces['T'].tolist() == [4.0, 5.0, 6.0]
+        assert traces['A'].dtype == np.float32
+        assert traces['peak_locations'].tolist() == [1, 2, 5]
+
+    def test_read_abif_channels_inline_payload(self, tmp_path):
+        """Test payloads of 4 bytes or less are read from the offset field."""
+        from sanger_qc_trim.ambiguous_calling import _read_abif_channels
+
+        ab1_path = tmp_path / "inline.ab1"
+        self._write_abif(ab1_path, self._channel_tags() + [(b'PLOC', 2, [7, 9])])
+
+        traces = _read_abif_channels(ab1_path)
+
+        assert traces['peak_locations'].tolist() == [7, 9]
+
+    def test_read_abif_channels_ploc1_fallback(self, tmp_path):
+        """Test PLOC1 is used when PLOC2 is missing."""
+        from sanger_qc_trim.ambiguous_calling import _read_abif_channels
+
+        ab1_path = tmp_path / "ploc1.ab1"
+        self._write_abif(ab1_path, self._channel_tags() + [(b'PLOC', 1, [3, 4, 8])])
+
+        traces = _read_abif_channels(ab1_path)
+
+        assert traces['peak_locations'].tolist() == [3, 4, 8]
+
+    def test_parse_abif_channels_from_bytes(self, tmp_path):
+        """Test parsing already-read bytes matches reading from the path."""
+        from sanger_qc_trim.ambiguous_calling import (
+            _parse_abif_channels, _read_abif_channels,
+        )
+
+        ab1_path = tmp_path / "bytes.ab1"
+        self._write_abif(ab1_path, self._channel_tags() + [(b'PLOC', 2, [1, 2, 5])])
+
+        from_bytes = _parse_abif_channels(ab1_path.read_bytes())
+        from_path = _read_abif_channels(ab1_path)
+
+        assert from_bytes.keys() == from_path.keys()
+        for key in from_path:
+            assert from_bytes[key].tolist() == from_path[key].tolist()
+
+    def test_read_abif_channels_not_abif(self, tmp_path):
+        """Test non-ABIF files return None."""
+        from sanger_qc_trim.ambiguous_calling import _read_abif_channels
+
+        path = tmp_path / "not_abif.ab1"
+        path.write_bytes(b"BEGIN_SEQUENCE sample\n")
+
+        assert _read_abif_channels(path) is None
+
+    def test_precompute_window_sums_matches_per_position(self):
+        """Test vectorized window sums agree with per-position integration."""
+        extractor = PeakIntensityExtractor()
+
+        traces = {
+            'A': np.array([10, 20, 100, 20, 10, 5, 60, 5]),
+            'C': np.array([5, 10, 50, 10, 5, 40, 4, 3]),
+            'G': np.array([8, 16, 80, 16, 8, 2, 1, 90]),
+            'T': np.array([3, 6, 30, 6, 3, 7, 7, 7]),
+            'peak_locations': np.array([0, 2, 6, 7, 12])  # last peak past trace end
+        }
+
+        sums = extractor.precompute_window_sums(traces, window=1)
+
+        assert sums.shape == (4, 5)
+        for pos in range(5):
+            expected = extractor.get_intensities_at_position(traces, pos, window=1)
+            assert sums[:, pos].tolist() == expected.tolist()
 
 
 class TestCreateAmbiguousCaller:
@@ -375,3 +709,117 @@ class TestBaseCallDataclass:
         assert bc.snr == 10.0
         assert bc.call_mode == 'ambiguous'
         assert 'heterozygous' in bc.flags
+
+
+class TestBaseCallArray:
+    """Test columnar BaseCallArray container."""
+
+    def test_round_trip_from_base_calls(self):
+        """Test packing BaseCall objects and reading them back as views."""
+        base_calls = [
+            BaseCall(0, 'A', 'A', 'G', 100.0, 12.5, 0.125, 10.0, 35, 'single', 0.875, []),
+            BaseCall(1, 'R', 'A', 'G', 100.0, 50.0, 0.5, 10.0, 25, 'ambiguous', 0.625,
+                     ['heterozygous']),
+            BaseCall(2, 'N', 'C', 'T', 48.0, 42.0, 0.875, 3.0, 10, 'N', 0.5,
+                     ['unclear_primary']),
+        ]
+        arr = BaseCallArray.from_base_calls(base_calls)
+
+        assert len(arr) == 3
+        assert arr.sequence == 'ARN'
+        assert arr[1] == base_calls[1]
+        assert list(arr) == base_calls
+
+    def test_slice_returns_array(self):
+        """Test slicing keeps the columnar container."""
+        caller = AmbiguousBaseCaller()
+        arr = caller._fallback_calling('ACGT', [40, 20, 5, 35])
+
+        sliced = arr[1:3]
+
+        assert isinstance(sliced, BaseCallArray)
+        assert sliced.sequence == 'CN'
+        assert list(sliced) == list(arr)[1:3]
+
+    def test_annotations_match_list_input(self):
+        """Test annotations are identical for list and columnar input."""
+        caller = AmbiguousBaseCaller()
+        arr = caller._fallback_calling('ACGT', [40, 20, 5, 35])
+        base_calls = list(arr)
+
+        assert caller.base_calls_to_sequence(arr) == 'ACNT'
+        assert (caller.base_calls_to_annotations(arr)
+                == caller.base_calls_to_annotations(base_calls))
+
+    def test_sequence_and_annotations_fused(self):
+        """Test the single-pass helper matches the separate conversions."""
+        caller = AmbiguousBaseCaller()
+        arr = caller._fallback_calling('ACGT', [40, 20, 5, 35])
+        expected = caller.base_calls_to_annotations(arr)
+
+        for base_calls in (arr, list(arr)):
+            seq, annotations = caller.base_calls_to_sequence_and_annotations(base_calls)
+            assert seq == 'ACNT'
+            assert annotations == expected
+
+    def test_annotations_table_matches_dicts(self):
+        """Test the annotation table has the same rows as the dict path."""
+        import types
+
+        caller = AmbiguousBaseCaller()
+        arr = caller._fallback_calling('ACGT', [40, 20, 5, 35])
+
+        table = caller.annotations_table(arr)
+
+        assert isinstance(caller.iter_annotations(arr), types.GeneratorType)
+        assert table.to_dict('records') == caller.base_calls_to_annotations(arr)
+
+    def test_column_dtypes(self):
+        """Test columns use compact dtypes."""
+        caller = AmbiguousBaseCaller()
+        arr = caller._fallback_calling('ACGT', [40, 20, 5, 35])
+
+        assert arr.primary_intensity.dtype == np.float32
+        assert arr.spr.dtype == np.float32
+        assert arr.snr.dtype == np.float32
+        assert arr.allele_fraction.dtype == np.float32
+        assert arr.quality.dtype == np.int16
+        assert arr.call_mode.dtype == np.int8
+
+
+class TestBatchCallFiles:
+    """Test parallel batch calling."""
+
+    def test_empty_batch(self):
+        """Test an empty batch returns no results."""
+        assert batch_call_files([]) == []
+
+    def test_batch_after_compiled_classifier(self, tmp_path):
+        """Test worker pools still shut down after the classifier has run."""
+        caller = AmbiguousBaseCaller()
+        n = 8
+        caller._classify(
+            np.zeros(n, dtype=np.int64), np.ones(n, dtype=np.int64),
+            np.full(n, 100.0, dtype=np.float32), np.full(n, 10.0, dtype=np.float32),
+            np.full(n, 0.1), np.full(n, 10.0), np.full(n, 35, dtype=np.int16)
+        )
+        assert batch_call_files([tmp_path / "missing.ab1"], max_workers=1) == [None]
+
+    def test_failed_call_does_not_abort_batch(self, monkeypatch, tmp_path):
+        """Test a file that fails during calling yields None."""
+        from sanger_qc_trim import ambiguous_calling
+
+        def broken_call_bases(self, ab1_path, sequence, qualities):
+            raise ValueError("corrupt trace")
+
+        monkeypatch.setattr(ambiguous_calling, 'parse_sequence_file',
+                            lambda path, fmt: ('ACGT', [30, 30, 30, 30]))
+        monkeypatch.setattr(AmbiguousBaseCaller, 'call_bases', broken_call_bases)
+        ambiguous_calling._init_batch_worker(AmbiguousCallingConfig())
+
+        assert ambiguous_calling._call_one_file(tmp_path / "bad.ab1") is None
+
+    def test_unparseable_files_return_none(self, tmp_path):
+        """Test files that fail to parse yield None in input order."""
+        paths = [tmp_path / "missing1.ab1", tmp_path / "missing2.ab1"]
+        assert batch_call_files(paths, max_workers=1) == [None, None]
@@ -0,0 +1,188 @@
+"""Tests for input discovery and file helpers."""
+
+import io
+import struct
+from pathlib import Path
+
+import numpy as np
+import pytest
+from Bio import SeqIO
+from sanger_qc_trim.io_utils import (
+    _classify, _read_abif_basecalls, detect_format, discover_files, get_sample_id,
+    parse_sequence_file,
+)
+
+
+@pytest.fixture
+def input_tree(tmp_path):
+    """A small directory tree of trace files with a duplicate sample."""
+    for rel in ["x.ab1", "x.phd.1", "y.PHD.1", "notes.txt",
+                "a/q.ab1", "a/b/r.AB1", "c/q.phd.1", "c/s.phd.1"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    (tmp_path / "dir.ab1").mkdir()
+    return tmp_path
+
+
+def test_discover_top_level_only(input_tree):
+    """Test non-recursive discovery ignores subdirectories and non-files."""
+    found = discover_files([str(input_tree)])
+
+    assert sorted(p.name for p, _ in found) == ["x.ab1", "y.PHD.1"]
+    assert dict((p.name, fmt) for p, fmt in found) == {"x.ab1": "ab1", "y.PHD.1": "phd.1"}
+
+
+def test_discover_recursive_prefers_ab1(input_tree):
+    """Test recursive discovery deduplicates samples in favour of .ab1."""
+    found = discover_files([str(input_tree)], recursive=True)
+    by_name = {p.name: fmt for p, fmt in found}
+
+    assert sorted(by_name) == ["q.ab1", "r.AB1", "s.phd.1", "x.ab1", "y.PHD.1"]
+    assert all(isinstance(p, Path) for p, _ in found)
+
+
+def test_discover_summarizes_ab1_preference(input_tree, caplog):
+    """Test ab1/phd pairs are summarized in one line, duplicates still warn."""
+    (input_tree / "c" / "x.ab1").write_bytes(b"")
+
+    with caplog.at_level("INFO", logger="sanger_qc_trim.io_utils"):
+        discover_files([str(input_tree)], recursive=True)
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "Using .ab1 instead of .phd.1 for 2 samples" in messages
+    assert not any(m.startswith(("Replacing", "Skipping")) for m in messages)
+    assert [r.levelname for r in caplog.records if "Duplicate sample_id" in r.getMessage()] == ["WARNING"]
+
+
+def test_discover_matches_glob_order(input_tree):
+    """Test the walk keeps the file order Path.glob would produce."""
+    (input_tree / "x.phd.1").unlink()
+    (input_tree / "c" / "q.phd.1").unlink()
+
+    found = discover_files([str(input_tree)], recursive=True)
+
+    expected = [p for p in input_tree.glob("**/*") if p.is_file() and p.name != "notes.txt"]
+    assert [p for p, _ in found] == expected
+
+
+def test_discover_explicit_files(input_tree):
+    """Test explicit file inputs, unknown formats and missing paths."""
+    found = discover_files([
+        str(input_tree / "a" / "q.ab1"),
+        str(input_tree / "notes.txt"),
+        str(input_tree / "missing.ab1"),
+    ])
+
+    assert found == [(input_tree / "a" / "q.ab1", "ab1")]
+
+
+def test_discover_manifest_reused_until_dir_changes(input_tree, tmp_path_factory, monkeypatch):
+    """Test the discovery manifest is reused, and dropped when a directory changes."""
+    from sanger_qc_trim import io_utils
+
+    cache_dir = tmp_path_factory.mktemp("cache")
+    first = discover_files([str(input_tree)], recursive=True, cache_dir=cache_dir)
+
+    def no_walk(*args, **kwargs):
+        raise AssertionError("directory walked despite a valid manifest")
+
+    with monkeypatch.context() as m:
+        m.setattr(io_utils, "_iter_files", no_walk)
+        assert discover_files([str(input_tree)], recursive=True, cache_dir=cache_dir) == first
+
+    # A new file in a nested directory changes only that directory's mtime
+    (input_tree / "a" / "b" / "new.ab1").write_bytes(b"")
+    updated = discover_files([str(input_tree)], recursive=True, cache_dir=cache_dir)
+
+    assert [p.name for p, _ in updated] == [p.name for p, _ in first] + ["new.ab1"]
+
+
+@pytest.mark.parametrize("name,fmt,sample_id", [
+    ("read.ab1", "ab1", "read"),
+    ("READ.AB1", "ab1", "READ"),
+    ("read.phd.1", "phd.1", "read"),
+    ("read.PHD.1", "phd.1", "read"),
+    ("read.ab1.gz", None, None),
+    ("read.phd.10", None, None),
+    (".ab1", None, None),
+])
+def test_classify(name, fmt, sample_id):
+    """Test filename classification agrees with the Path-based helpers."""
+    assert _classify(name) == (fmt, sample_id)
+    assert detect_format(Path("dir") / name) == fmt
+    assert detect_format(f"dir/{name}") == fmt
+    if sample_id is not None:
+        assert get_sample_id(Path("dir") / name) == sample_id
+        assert get_sample_id(f"dir/{name}") == sample_id
+
+
+def _abif_bytes(tags):
+    """Build a minimal ABIF file from (name, number, payload) char tags."""
+    payload = b""
+    entries = b""
+    data_start = 128
+    for name, number, raw in tags:
+        if len(raw) <= 4:
+            # Small payloads live in the data offset field itself
+            offset, = struct.unpack(">i", raw.ljust(4, b"\0"))
+        else:
+            offset = data_start + len(payload)
+            payload += raw
+        entries += struct.pack(">4sihhiiii", name, number, 2, 1, len(raw), len(raw), offset, 0)
+    dir_offset = data_start + len(payload)
+    header = b"ABIF" + struct.pack(">h", 101) + struct.pack(
+        ">4sihhiiii", b"tdir", 1, 1023, 28, len(tags), len(entries), dir_offset, 0
+    )
+    return header.ljust(data_start, b"\0") + payload + entries
+
+
+@pytest.mark.parametrize("seq,quals", [("ACGTNACGTA", [5, 10, 20, 30, 2, 40, 35, 30, 20, 10]),
+                                       ("AC", [12, 40])])
+def test_abif_basecalls_match_biopython(seq, quals):
+    """Test the direct ABIF reader agrees with SeqIO's abi parser."""
+    data = _abif_bytes([(b"PBAS", 2, seq.encode()), (b"PCON", 2, bytes(quals))])
+    record = SeqIO.read(io.BytesIO(data), "abi")
+
+    got_seq, got_quals = _read_abif_basecalls(data)
+
+    assert got_seq == str(record.seq) == seq
+    assert got_quals.dtype == np.uint8
+    assert got_quals.tolist() == record.letter_annotations["phred_quality"]
+
+
+def test_abif_basecalls_fallback_cases():
+    """Test inputs the fast path can't handle exactly are left to Biopython."""
+    assert _read_abif_basecalls(b"BEGIN_SEQUENCE x\n") is None
+    assert _read_abif_basecalls(_abif_bytes([(b"PBAS", 2, b"ACGTA")])) is None
+    assert _read_abif_basecalls(
+        _abif_bytes([(b"PBAS", 2, b"ACGTA"), (b"PCON", 2, bytes([10, 20, 30]))])
+    ) is None
+
+
+def test_parse_cache_reuses_and_invalidates(tmp_path, tmp_path_factory, monkeypatch):
+    """Test cached parses are reused until the input file changes."""
+    from sanger_qc_trim import io_utils
+
+    def write_phd(seq, quals):
+        lines = ["BEGIN_SEQUENCE read", "", "BEGIN_COMMENT", "", "END_COMMENT", "", "BEGIN_DNA"]
+        lines += [f"{b} {q} {10 * i}" for i, (b, q) in enumerate(zip(seq, quals))]
+        lines += ["END_DNA", "", "END_SEQUENCE", ""]
+        path.write_text("\n".join(lines))
+
+    path = tmp_path / "read.phd.1"
+    cache_dir = tmp_path_factory.mktemp("cache")
+    write_phd("ACGT", [10, 20, 30, 40])
+
+    seq, quals = parse_sequence_file(path, "phd.1", cache_dir=cache_dir)
+    assert seq == "ACGT"
+
+    with monkeypatch.context() as m:
+        m.setattr(io_utils, "_parse_phd", lambda *a: pytest.fail("parsed despite cache"))
+        cached = parse_sequence_file(path, "phd.1", cache_dir=cache_dir)
+        assert cached[0] == seq and cached[1].tolist() == quals.tolist()
+        # PHD files have no raw contents, so with_raw can be served from cache too
+        assert parse_sequence_file(path, "phd.1", with_raw=True, cache_dir=cache_dir)[2] is None
+
+    write_phd("GGCCA", [40, 40, 30, 20, 10])
+    assert parse_sequence_file(path, "phd.1", cache_dir=cache_dir)[0] == "GGCCA"
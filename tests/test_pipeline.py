@@ -0,0 +1,134 @@
+"""Tests for the shared per-file processing pipeline."""
+
+import gzip
+import random
+
+import pytest
+from sanger_qc_trim.ambiguous_calling import CallerConfig
+from sanger_qc_trim.io_utils import parse_sequence_files
+from sanger_qc_trim.pipeline import _cached_call_bases, run_pipeline
+
+
+def _write_phd(path, seq, quals):
+    """Write a minimal PHD file with one sequence."""
+    lines = [f"BEGIN_SEQUENCE {path.stem}", "", "BEGIN_COMMENT", "", "END_COMMENT", "", "BEGIN_DNA"]
+    lines += [f"{base} {q} {10 * i}" for i, (base, q) in enumerate(zip(seq, quals))]
+    lines += ["END_DNA", "", "END_SEQUENCE", ""]
+    path.write_text("\n".join(lines))
+
+
+@pytest.fixture
+def phd_files(tmp_path):
+    """A handful of synthetic PHD reads plus one unparseable file."""
+    rng = random.Random(0)
+    files = []
+    for i in range(6):
+        n = 80 + 10 * i
+        seq = "".join(rng.choice("ACGT") for _ in range(n))
+        quals = [rng.randint(5, 10)] * 5 + [rng.randint(20, 40) for _ in range(n - 10)] + [8] * 5
+        path = tmp_path / f"read{i}.phd.1"
+        _write_phd(path, seq, quals)
+        files.append((path, "phd.1"))
+
+    broken = tmp_path / "broken.phd.1"
+    broken.write_text("not a phd file\n")
+    files.insert(3, (broken, "phd.1"))
+    return files
+
+
+class TestPipeline:
+    """Tests for run_pipeline and its drivers."""
+
+    def test_prefetch_preserves_order(self, phd_files):
+        """Prefetching yields files in input order, including failures."""
+        got = list(parse_sequence_files(phd_files, max_workers=2, depth=2))
+
+        assert [(p, f) for p, f, _ in got] == phd_files
+        assert got[3][2] is None
+        assert all(parsed is not None for i, (_, _, parsed) in enumerate(got) if i != 3)
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_run_pipeline_outputs(self, phd_files, tmp_path, jobs):
+        """Serial and pooled runs stream the same reads, in input order."""
+        out_dir = tmp_path / f"out{jobs}"
+        result = run_pipeline(
+            phd_files,
+            output_dir=out_dir,
+            do_qc=True,
+            do_trim=True,
+            do_plots=False,
+            caller_cfg=None,
+            method="mott",
+            qthreshold=20,
+            min_length=10,
+            jobs=jobs,
+        )
+
+        assert result.n_reads == 6
+        assert result.skipped_count == 1
+        assert result.summary["total_reads"] == 6
+
+        with gzip.open(out_dir / "trim" / "trimmed.fastq.gz", "rt") as f:
+            headers = [line for line in f if line.startswith("@read")]
+        assert [h.split("/")[0] for h in headers] == [f"@read{i}" for i in range(6)]
+        assert (out_dir / "qc" / "per_read_metrics.csv").exists()
+
+    def test_call_bases_cache(self, tmp_path):
+        """A cached result is returned without calling the caller again."""
+
+        class CountingCaller:
+            calls = 0
+
+            def call_bases(self, file_path, seq, quals, **kwargs):
+                self.calls += 1
+                return [seq, list(quals)]
+
+        ab1 = tmp_path / "read.ab1"
+        ab1.write_bytes(b"ABIF-bytes")
+        cache_dir = tmp_path / "cache"
+        caller = CountingCaller()
+        cfg = CallerConfig(True, 0.20, 0.33, 0.67)
+
+        first = _cached_call_bases(caller, ab1, "ACGT", [30] * 4, cfg, cache_dir)
+        second = _cached_call_bases(caller, ab1, "ACGT", [30] * 4, cfg, cache_dir)
+        assert first == second
+        assert caller.calls == 1
+
+        # A different config or changed file contents miss the cache
+        _cached_call_bases(caller, ab1, "ACGT", [30] * 4, cfg._replace(spr_noise_max=0.3), cache_dir)
+        ab1.write_bytes(b"ABIF-other")
+        _cached_call_bases(caller, ab1, "ACGT", [30] * 4, cfg, cache_dir)
+        assert caller.calls == 3
+
+        # No cache dir disables caching
+        _cached_call_bases(caller, ab1, "ACGT", [30] * 4, cfg, None)
+        assert caller.calls == 4
+
+    def test_plot_batch_columns(self, phd_files, tmp_path):
+        """Plot data is collected column-wise and matches the metrics written."""
+        import pandas as pd
+
+        out_dir = tmp_path / "out"
+        result = run_pipeline(
+            phd_files,
+            output_dir=out_dir,
+            do_qc=True,
+            do_trim=False,
+            do_plots=True,
+            caller_cfg=None,
+            method="mott",
+            qthreshold=20,
+            min_length=10,
+            jobs=1,
+        )
+
+        batch = result.plot_batch
+        metrics = pd.read_csv(out_dir / "qc" / "per_read_metrics.csv")
+        assert len(batch) == len(metrics) == 6
+        assert list(batch.column("sample_id")) == list(metrics["sample_id"])
+        assert batch.column("trimmed_length").tolist() == metrics["trimmed_length"].tolist()
+        assert batch.column("mean_q").tolist() == pytest.approx(metrics["mean_q"].tolist())
+
+        rows = batch.rows(2)
+        assert [r["sample_id"] for r in rows] == ["read0", "read1"]
+        assert rows[0]["trim_end"] - rows[0]["trim_start"] == metrics["trimmed_length"][0]
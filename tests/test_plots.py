@@ -0,0 +1,42 @@
+"""Tests for plot helpers."""
+
+import numpy as np
+from sanger_qc_trim.plots import _ascii_column, _customdata, _m4_downsample
+
+
+def test_m4_short_series_unchanged():
+    """Test series within the point budget are returned as-is."""
+    quals = np.arange(40) % 7
+
+    x, y = _m4_downsample(quals, width_px=10)
+
+    assert x.tolist() == list(range(40))
+    assert y.tolist() == quals.tolist()
+
+
+def test_m4_keeps_extremes_and_endpoints():
+    """Test each bucket keeps its first, last, min and max points."""
+    rng = np.random.default_rng(0)
+    quals = rng.integers(0, 60, 1000)
+
+    x, y = _m4_downsample(quals, width_px=50)
+
+    assert len(x) <= 4 * 50
+    assert np.all(np.diff(x) > 0)
+    assert x[0] == 0 and x[-1] == 999
+    assert y.tolist() == quals[x].tolist()
+    for start in range(0, 1000, 20):
+        bucket = quals[start:start + 20]
+        kept = y[(x >= start) & (x < start + 20)]
+        assert kept.min() == bucket.min() and kept.max() == bucket.max()
+
+
+def test_customdata_rows_match_columns():
+    """Test hover rows hold Python values picked from each column."""
+    bases = _ascii_column(np.frombuffer(b"ACGTN", dtype=np.uint8))
+    sprs = np.array([0.1, 0.2, 0.3, 0.4, 0.5], dtype=np.float32).astype(object)
+
+    rows = _customdata([bases, sprs], [1, 4])
+
+    assert rows.tolist() == [["C", float(np.float32(0.2))], ["N", float(np.float32(0.5))]]
+    assert type(rows[0, 1]) is float
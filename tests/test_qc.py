@@ -1,7 +1,18 @@
 """Tests for QC statistics computation."""
 
+import math
+import random
+
+import numpy as np
 import pytest
-from sanger_qc_trim.qc import compute_qc_metrics, compute_summary_stats, _longest_hq_stretch
+from sanger_qc_trim.qc import (
+    compute_qc_metrics,
+    compute_qc_metrics_batch,
+    compute_qc_metrics_failed,
+    compute_summary_stats,
+    _longest_hq_stretch,
+    _longest_true_run,
+)
 
 
 class TestQCMetrics:
@@ -150,6 +161,19 @@ class TestQCMetrics:
 
         assert metrics["passed_minlen"] == "no"
 
+    def test_numpy_fallback_matches(self, monkeypatch):
+        """Test the NumPy path gives the same metrics as the fused kernel."""
+        from sanger_qc_trim import qc
+
+        rng = random.Random(3)
+        reads = [[rng.randint(0, 60) for _ in range(n)] for n in (0, 1, 9, 250, 900)]
+        fused = [compute_qc_metrics("s", "s.ab1", "ab1", "A" * len(q), q, 0, len(q), 20, 5) for q in reads]
+
+        monkeypatch.setattr(qc, "HAVE_NUMBA", False)
+        plain = [compute_qc_metrics("s", "s.ab1", "ab1", "A" * len(q), q, 0, len(q), 20, 5) for q in reads]
+
+        assert fused == plain
+
 
 class TestLongestHQStretch:
     """Tests for longest high-quality stretch calculation."""
@@ -184,6 +208,17 @@ class TestLongestHQStretch:
         result = _longest_hq_stretch(quals, 20)
         assert result == 0
 
+    def test_matches_numpy_run_length(self):
+        """Random reads agree with the NumPy run-length reduction."""
+        rng = np.random.default_rng(0)
+        for n in [1, 2, 5, 50, 800]:
+            for _ in range(20):
+                quals = rng.integers(0, 60, size=n)
+                for threshold in (0, 20, 30, 61):
+                    expected = int(_longest_true_run((quals >= threshold)[np.newaxis, :])[0])
+                    assert _longest_hq_stretch(quals.tolist(), threshold) == expected
+                    assert _longest_hq_stretch(quals.astype(np.uint8), threshold) == expected
+
 
 class TestSummaryStats:
     """Tests for summary statistics computation."""
@@ -264,3 +299,97 @@ class TestSummaryStats:
         assert summary["reads_passed_minlen"] == 0
         assert summary["reads_failed_minlen"] == 0
         assert summary["pct_passed"] == 0.0
+
+
+class TestQCMetricsBatch:
+    """Tests for vectorized batch QC metrics."""
+
+    def test_matches_per_read(self):
+        """Batch results equal compute_qc_metrics row by row."""
+        rng = random.Random(1)
+        records = []
+        for i, n in enumerate([0, 1, 7, 120, 800, 33]):
+            seq = "".join(rng.choice("ACGTNacgtn") for _ in range(n))
+            quals = [rng.randint(0, 60) for _ in range(n)]
+            start = rng.randint(0, n)
+            records.append({
+                "sample_id": f"s{i}",
+                "source_file": f"s{i}.ab1",
+                "file_format": "ab1",
+                "seq": seq,
+                "quals": quals,
+                "trim_start": start,
+                "trim_end": rng.randint(start, n),
+                "qthreshold": rng.choice([20, 30]),
+                "min_length": 5,
+            })
+
+        df = compute_qc_metrics_batch(records)
+        expected = [compute_qc_metrics(**r) for r in records]
+
+        assert list(df.columns) == list(expected[0])
+        for row, exp in zip(df.to_dict("records"), expected):
+            assert row == pytest.approx(exp)
+
+    def test_numpy_fallback_matches(self, monkeypatch):
+        """The padded NumPy path gives the same frame as the compiled one."""
+        from sanger_qc_trim import qc
+
+        rng = random.Random(2)
+        records = [
+            {
+                "sample_id": f"s{n}", "source_file": f"s{n}.ab1", "file_format": "ab1",
+                "seq": "ACGTN"[: n % 5] * n, "quals": [rng.randint(0, 60) for _ in range(n)],
+                "trim_start": 0, "trim_end": n, "qthreshold": 20, "min_length": 5,
+            }
+            for n in (0, 1, 6, 90, 400)
+        ]
+        compiled = compute_qc_metrics_batch(records)
+
+        monkeypatch.setattr(qc, "HAVE_NUMBA", False)
+        assert compute_qc_metrics_batch(records).equals(compiled)
+
+    def test_empty_batch(self):
+        """Empty input gives an empty frame with the metric columns."""
+        df = compute_qc_metrics_batch([])
+        assert len(df) == 0
+        assert "mean_q" in df.columns
+
+
+class TestFailedReadMetrics:
+    """Tests for the lightweight metrics of reads failing min_length."""
+
+    def _args(self):
+        return dict(
+            sample_id="s",
+            source_file="s.ab1",
+            file_format="ab1",
+            seq="ACGNNT",
+            quals=[30, 30, 10, 10, 30, 30],
+            trim_start=0,
+            trim_end=2,
+            qthreshold=20,
+            min_length=5,
+        )
+
+    def test_failed_metrics(self):
+        """Counts match compute_qc_metrics; quality stats are NaN."""
+        full = compute_qc_metrics(**self._args())
+        light = compute_qc_metrics_failed(**self._args())
+
+        assert list(light) == list(full)
+        for key in ("raw_length", "n_count", "hq_longest_stretch_len",
+                    "trim_start", "trim_end", "trimmed_length", "passed_minlen"):
+            assert light[key] == full[key]
+        for key in ("mean_q", "median_q", "pct_q20", "pct_q30", "gc_percent", "expected_errors"):
+            assert math.isnan(light[key])
+
+    def test_summary_ignores_nan(self):
+        """NaN quality metrics are left out of the summary averages."""
+        passing = dict(self._args(), trim_end=6)
+        metrics = [compute_qc_metrics(**passing), compute_qc_metrics_failed(**self._args())]
+
+        summary = compute_summary_stats(metrics)
+        assert summary["mean_mean_q"] == metrics[0]["mean_q"]
+        assert summary["mean_trimmed_length"] == 4.0
+        assert summary["reads_failed_minlen"] == 1
@@ -1,7 +1,8 @@
 """Tests for trimming algorithms."""
 
+import numpy as np
 import pytest
-from sanger_qc_trim.trim import trim_mott, trim_ends, apply_trim
+from sanger_qc_trim.trim import trim_mott, trim_ends, apply_trim, get_trimmer
 
 
 class TestTrimMott:
@@ -60,6 +61,26 @@ class TestTrimMott:
         # Second region (indices 4-7) has better score
         assert result == (4, 7)
 
+    def test_matches_scalar_kadane(self):
+        """Random reads match the original one-base-at-a-time Kadane loop."""
+
+        def scalar_mott(quals, threshold):
+            max_sum = cur_sum = best_start = best_end = cur_start = 0
+            for i, q in enumerate(quals):
+                cur_sum += q - threshold
+                if cur_sum <= 0:
+                    cur_sum, cur_start = 0, i + 1
+                elif cur_sum > max_sum:
+                    max_sum, best_start, best_end = cur_sum, cur_start, i + 1
+            return (best_start, best_end)
+
+        rng = np.random.default_rng(1)
+        for n in [1, 2, 3, 5, 10, 60]:
+            for _ in range(200):
+                quals = rng.integers(0, 40, size=n).tolist()
+                for threshold in (0, 10, 20, 41):
+                    assert trim_mott(quals, threshold) == scalar_mott(quals, threshold)
+
 
 class TestTrimEnds:
     """Tests for ends trimming algorithm."""
@@ -182,3 +203,44 @@ class TestQualityThresholds:
         result = trim_mott(quals, 20)
         # [0, 0, 0] -> no positive weights, returns (0, 0)
         assert result == (0, 0)
+
+
+class TestCompiledTrim:
+    """The apply_trim fast path must match the reference implementations."""
+
+    @pytest.mark.parametrize("method, reference", [("mott", trim_mott), ("ends", trim_ends)])
+    def test_matches_reference(self, method, reference):
+        """Random reads give the same coordinates as trim_mott/trim_ends."""
+        rng = np.random.default_rng(0)
+        for n in [1, 2, 5, 50, 800]:
+            for _ in range(20):
+                quals = rng.integers(0, 60, size=n).tolist()
+                seq = "A" * n
+                for threshold in (0, 20, 30, 61):
+                    _, _, start, end = apply_trim(seq, quals, method, threshold)
+                    assert (start, end) == reference(quals, threshold)
+
+    @pytest.mark.parametrize("method, reference", [("mott", trim_mott), ("ends", trim_ends)])
+    def test_uint8_qualities(self, method, reference):
+        """uint8 quality arrays trim like lists and keep their type."""
+        quals = [5, 10, 30, 35, 12, 40, 8, 2]
+        arr = np.array(quals, dtype=np.uint8)
+
+        assert reference(arr, 20) == reference(quals, 20)
+        _, trimmed, start, end = apply_trim("ACGTACGT", arr, method, 20)
+        assert (start, end) == reference(quals, 20)
+        assert trimmed.dtype == np.uint8
+
+    @pytest.mark.parametrize("method, reference", [("mott", trim_mott), ("ends", trim_ends)])
+    def test_get_trimmer(self, method, reference, monkeypatch):
+        """get_trimmer resolves to the compiled kernel or the reference function."""
+        from sanger_qc_trim import trim
+
+        quals = [5, 10, 30, 35, 12, 40, 8, 2]
+        assert get_trimmer(method)(quals, 20) == reference(quals, 20)
+        assert get_trimmer(method)([], 20) == (0, 0)
+
+        monkeypatch.setattr(trim, "HAVE_NUMBA", False)
+        assert get_trimmer(method) is reference
+        with pytest.raises(ValueError):
+            get_trimmer("invalid")
@@ -0,0 +1,98 @@
+"""Tests for output writers."""
+
+import gzip
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from sanger_qc_trim import writers
+from sanger_qc_trim.writers import (
+    TrimmedSequenceWriter, open_trimmed_fasta, open_trimmed_fastq, write_all_base_call_annotations,
+    write_base_call_annotations,
+)
+
+
+def test_fastq_records_across_chunks(tmp_path, monkeypatch):
+    """Test records spanning several write chunks come back complete and in order."""
+    monkeypatch.setattr(TrimmedSequenceWriter, "CHUNK_RECORDS", 3)
+    path = tmp_path / "out" / "trimmed.fastq.gz"
+    reads = [(f"r{i}", "ACGT"[: i % 4 + 1], np.arange(i % 4 + 1, dtype=np.uint8) * 10) for i in range(7)]
+    # Quality lists are accepted as well as arrays
+    reads[1] = (reads[1][0], reads[1][1], [40, 2])
+
+    with open_trimmed_fastq(path) as writer:
+        for read_id, seq, quals in reads:
+            writer.write({"read_id": read_id, "seq": seq, "quals": quals})
+
+    expected = "".join(
+        f"@{read_id}\n{seq}\n+\n{''.join(chr(q + 33) for q in quals)}\n" for read_id, seq, quals in reads
+    )
+    assert gzip.open(path, "rt").read() == expected
+    assert writer.count == 7
+
+
+def test_fasta_without_records_creates_nothing(tmp_path):
+    """Test the file is only created once a record is written."""
+    path = tmp_path / "trimmed.fasta.gz"
+
+    with open_trimmed_fasta(path):
+        pass
+
+    assert not path.exists()
+
+
+def _annotations(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "position": np.arange(n),
+        "called_base": rng.choice(list("ACGTN"), n),
+        "spr": np.round(rng.random(n), 4),
+        "flags": rng.choice(["", "low_snr"], n),
+    })
+
+
+def test_all_base_calls_match_concatenated_frame(tmp_path, monkeypatch):
+    """Test streamed CSV/Parquet equal the concatenation of every sample's table."""
+    monkeypatch.setattr(writers, "BASE_CALL_ROW_GROUP_ROWS", 3)
+    tables = {"empty": _annotations(0, 0).astype(object), "a": _annotations(4, 1), "b": _annotations(9, 2)}
+
+    write_all_base_call_annotations(tables, tmp_path)
+
+    expected = pd.concat(
+        [t.assign(sample_id=s)[["sample_id", *t.columns]] for s, t in tables.items() if len(t)],
+        ignore_index=True,
+    )
+    base_calls = tmp_path / "base_calls"
+    pd.testing.assert_frame_equal(pd.read_parquet(base_calls / "all_base_calls.parquet"), expected)
+    assert (base_calls / "all_base_calls.csv").read_text() == expected.to_csv(index=False)
+    metadata = pq.ParquetFile(base_calls / "all_base_calls.parquet").metadata
+    assert metadata.num_row_groups == 2
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+
+def test_all_base_calls_pyarrow_csv_reads_back_the_same(tmp_path):
+    """Test the pyarrow CSV engine writes the same values as pandas."""
+    tables = {"a": _annotations(4, 1), "b": _annotations(9, 2)}
+
+    write_all_base_call_annotations(tables, tmp_path / "pandas")
+    write_all_base_call_annotations(tables, tmp_path / "pyarrow", csv_engine="pyarrow")
+
+    csv_name = "base_calls/all_base_calls.csv"
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "pyarrow" / csv_name, keep_default_na=False),
+        pd.read_csv(tmp_path / "pandas" / csv_name, keep_default_na=False),
+    )
+
+
+def test_base_call_dicts_write_like_a_frame(tmp_path):
+    """Test annotation dicts give the same per-sample CSV as the equivalent frame."""
+    rows = [
+        {"position": 0, "called_base": "A", "spr": 0.25, "flags": None},
+        {"position": 1, "called_base": "R", "spr": float("nan"), "flags": "het", "snr": np.float64(3.5)},
+        {"position": 2, "called_base": "N", "spr": 1.0},
+    ]
+    write_base_call_annotations("s1", rows, tmp_path / "dicts")
+    write_base_call_annotations("s1", pd.DataFrame(rows), tmp_path / "frame")
+
+    got = (tmp_path / "dicts" / "base_calls" / "s1_base_calls.csv").read_text()
+    assert got == (tmp_path / "frame" / "base_calls" / "s1_base_calls.csv").read_text()